@@ -0,0 +1,116 @@
+import math
+import statistics
+import time
+
+from typed_arrays import copy_array
+
+# Untimed calls made before sampling, so caches, allocator and branch history are warm
+WARMUP_RUNS = 1
+
+# Sample count bounds: at least MIN_RUNS samples, stopping once the confidence interval
+# of the median is within TARGET_PRECISION of it or MAX_RUNS samples have been taken
+MIN_RUNS = 5
+MAX_RUNS = 50
+TARGET_PRECISION = 0.05
+
+# Stop sampling a slow function after this many seconds once MIN_RUNS_WHEN_SLOW samples exist
+TIME_BUDGET = 2.0
+MIN_RUNS_WHEN_SLOW = 3
+
+# Without a setup, calls are batched until one sample lasts at least this long, so
+# timer resolution and call overhead do not dominate sub-microsecond functions
+MIN_SAMPLE_NS = 100000
+
+# z value for a two-sided 95% interval
+Z_95 = 1.96
+
+# Summary of one measured function. All times are per call, in nanoseconds
+class Measurement:
+    def __init__(self, samples_ns, calls_per_sample=1):
+        self.samples_ns = sorted(samples_ns)
+        self.calls_per_sample = calls_per_sample
+        self.runs = len(samples_ns)
+
+        if self.runs >= 2:
+            self.q1, self.median, self.q3 = statistics.quantiles(self.samples_ns, n=4, method='inclusive')
+        else:
+            self.q1 = self.median = self.q3 = self.samples_ns[0]
+        self.iqr = self.q3 - self.q1
+        self.ci_low, self.ci_high = median_confidence_interval(self.samples_ns)
+
+        # Tukey's fences: samples more than 1.5 IQR outside the quartiles
+        low_fence = self.q1 - 1.5 * self.iqr
+        high_fence = self.q3 + 1.5 * self.iqr
+        self.outliers = [s for s in self.samples_ns if s < low_fence or s > high_fence]
+
+    @property
+    def seconds(self):
+        return self.median / 1e9
+
+    # Half-width of the median's confidence interval relative to the median
+    @property
+    def precision(self):
+        if self.median == 0:
+            return 0.0
+        return (self.ci_high - self.ci_low) / 2 / self.median
+
+    def __str__(self):
+        return (f"median {format_ns(self.median)} (IQR {format_ns(self.iqr)}, "
+                f"95% CI +/-{self.precision * 100:.1f}%, {self.runs} runs, {len(self.outliers)} outliers)")
+
+# Distribution-free 95% interval for the median from the order statistics of the samples
+# (normal approximation to the binomial); the full range when there are too few samples
+def median_confidence_interval(sorted_samples):
+    n = len(sorted_samples)
+    half_width = Z_95 * math.sqrt(n) / 2
+    low = max(0, math.floor(n / 2 - half_width))
+    high = min(n - 1, math.ceil(n / 2 + half_width) - 1)
+    return sorted_samples[low], sorted_samples[high]
+
+def format_ns(ns):
+    for unit, scale in (('s', 1e9), ('ms', 1e6), ('us', 1e3)):
+        if ns >= scale:
+            return f"{ns / scale:.3f} {unit}"
+    return f"{ns:.0f} ns"
+
+# Time func(*args) and return a Measurement. If setup is given it is called (untimed)
+# before every call and must return the argument tuple, so functions that mutate their
+# input always start from the same state
+def measure(func, *args, setup=None, warmup=WARMUP_RUNS, min_runs=MIN_RUNS, max_runs=MAX_RUNS,
+            precision=TARGET_PRECISION, time_budget=TIME_BUDGET):
+    for _ in range(warmup):
+        func(*(setup() if setup is not None else args))
+
+    calls = 1 if setup is not None else calibrate(func, args)
+
+    samples = []
+    started = time.perf_counter_ns()
+    while len(samples) < max_runs:
+        call_args = setup() if setup is not None else args
+        start = time.perf_counter_ns()
+        for _ in range(calls):
+            func(*call_args)
+        samples.append((time.perf_counter_ns() - start) / calls)
+
+        if len(samples) >= min_runs and Measurement(samples).precision <= precision:
+            break
+        if len(samples) >= MIN_RUNS_WHEN_SLOW and time.perf_counter_ns() - started > time_budget * 1e9:
+            break
+
+    return Measurement(samples, calls)
+
+# Number of back-to-back calls needed for one sample to last MIN_SAMPLE_NS
+def calibrate(func, args):
+    calls = 1
+    while True:
+        start = time.perf_counter_ns()
+        for _ in range(calls):
+            func(*args)
+        if time.perf_counter_ns() - start >= MIN_SAMPLE_NS:
+            return calls
+        calls *= 10
+
+# Time an in-place sort on a fresh copy of arr for every call, so each algorithm
+# measured on arr sees identical input
+def measure_sort(sort, arr, *args, **options):
+    return measure(sort, setup=lambda: (copy_array(arr),) + args, **options)
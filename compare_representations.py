@@ -0,0 +1,34 @@
+import random
+import sys
+import time
+
+from ex1 import merge_sort
+from sorting import introsort
+from typed_arrays import REPRESENTATIONS, copy_array, memory_bytes, to_representation
+from vectorized import np
+
+# Memory and sort time of the same random input in every representation
+def compare_representations(sizes):
+    for size in sizes:
+        print(f"Testing with size: {size}")
+        values = random.sample(range(size * 10), size)
+
+        for representation in REPRESENTATIONS:
+            if representation == 'numpy' and np is None:
+                continue
+            arr = to_representation(values, representation)
+
+            start_time = time.perf_counter()
+            introsort(copy_array(arr))
+            quick_time = time.perf_counter() - start_time
+
+            start_time = time.perf_counter()
+            merge_sort(copy_array(arr), 0, size - 1)
+            merge_time = time.perf_counter() - start_time
+
+            print(f"  {representation:<10} memory: {memory_bytes(arr):>10} bytes  "
+                  f"quicksort: {quick_time:.4f}s  merge sort: {merge_time:.4f}s")
+
+# Usage: python compare_representations.py [size ...]
+if __name__ == "__main__":
+    compare_representations([int(arg) for arg in sys.argv[1:]] or [1000, 10000, 100000])
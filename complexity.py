@@ -0,0 +1,168 @@
+import math
+
+# Growth terms g(n) of the candidate models y = a + b * g(n) (O(1) is just y = a)
+GROWTH = {
+    'O(1)': None,
+    'O(log n)': lambda n: math.log2(n),
+    'O(n)': lambda n: n,
+    'O(n log n)': lambda n: n * math.log2(n),
+    'O(n^2)': lambda n: n * n,
+}
+
+# Power law y = c * n^k, fitted as a line in log-log space
+POWER_LAW = 'power law'
+
+# Simplest first: best_fit prefers the earliest model whose AICc is within AIC_TOLERANCE
+# of the lowest, so noise alone cannot promote O(1) data to a tiny n^2 term
+MODELS = tuple(GROWTH) + (POWER_LAW,)
+AIC_TOLERANCE = 2.0
+
+# One fitted model. Errors are relative ((y - fit) / y) when every value is positive,
+# so sizes whose timings differ by orders of magnitude weigh the same; absolute otherwise
+class Fit:
+    def __init__(self, model, coefficients, parameters):
+        self.model = model
+        self.coefficients = coefficients
+        self.parameters = parameters
+        self.rss = None
+        self.aic = None
+        self.cv_error = None
+
+    def predict(self, n):
+        a, b = self.coefficients
+        if self.model == POWER_LAW:
+            return a * n ** b
+        growth = GROWTH[self.model]
+        return a if growth is None else a + b * growth(n)
+
+    def __str__(self):
+        a, b = self.coefficients
+        if self.model == 'O(1)':
+            return f"O(1): {a:.3e}"
+        if self.model == POWER_LAW:
+            return f"power law: {a:.3e} * n^{b:.3f}"
+        term = self.model[2:-1]
+        return f"{self.model}: {b:.3e} * {term} + {a:.3e}"
+
+# Akaike information criterion with the small-sample correction (AICc)
+def aic(rss, points, parameters):
+    if rss <= 0:
+        return -math.inf
+    value = points * math.log(rss / points) + 2 * parameters
+    if points - parameters - 1 > 0:
+        value += 2 * parameters * (parameters + 1) / (points - parameters - 1)
+    return value
+
+def fit_model(model, sizes, values):
+    weights = relative_weights(values)
+
+    if model == POWER_LAW:
+        if any(n <= 0 for n in sizes) or any(y <= 0 for y in values):
+            return None
+        intercept, slope = least_squares([math.log(n) for n in sizes], [math.log(y) for y in values],
+                                         [1.0] * len(sizes))
+        coefficients = (math.exp(intercept), slope)
+        parameters = 2
+    elif GROWTH[model] is None:
+        total = sum(weights)
+        coefficients = (sum(w * y for w, y in zip(weights, values)) / total, 0.0)
+        parameters = 1
+    else:
+        growth = GROWTH[model]
+        coefficients = least_squares([growth(n) for n in sizes], values, weights)
+        parameters = 2
+
+    fit = Fit(model, coefficients, parameters)
+    fit.rss = sum(w * (y - fit.predict(n)) ** 2 for n, y, w in zip(sizes, values, weights))
+    fit.aic = aic(fit.rss, len(sizes), parameters)
+    return fit
+
+def relative_weights(values):
+    if all(y > 0 for y in values):
+        return [1 / (y * y) for y in values]
+    return [1.0] * len(values)
+
+# Weighted least squares line y = a + b * x; returns (a, b)
+def least_squares(xs, ys, weights):
+    total = sum(weights)
+    mean_x = sum(w * x for w, x in zip(weights, xs)) / total
+    mean_y = sum(w * y for w, y in zip(weights, ys)) / total
+    sxx = sum(w * (x - mean_x) ** 2 for w, x in zip(weights, xs))
+    sxy = sum(w * (x - mean_x) * (y - mean_y) for w, x, y in zip(weights, xs, ys))
+    slope = sxy / sxx if sxx else 0.0
+    return mean_y - slope * mean_x, slope
+
+# Mean squared (relative) error of predicting each point from a fit to the others
+def cross_validation_error(model, sizes, values):
+    weights = relative_weights(values)
+    errors = []
+    for i in range(len(sizes)):
+        fit = fit_model(model, sizes[:i] + sizes[i + 1:], values[:i] + values[i + 1:])
+        if fit is None:
+            return math.inf
+        errors.append(weights[i] * (values[i] - fit.predict(sizes[i])) ** 2)
+    return sum(errors) / len(errors)
+
+# Fit every model to a metric series (time, comparisons, swaps, ...) measured at sizes.
+# Returns the fits best first, ranked by AICc or, with criterion='cv', by leave-one-out error
+def fit_models(sizes, values, criterion='aic'):
+    sizes = list(sizes)
+    values = list(values)
+    if len(sizes) != len(values) or len(sizes) < 3:
+        raise ValueError("Need at least 3 (size, value) points to fit")
+
+    fits = []
+    for model in MODELS:
+        fit = fit_model(model, sizes, values)
+        if fit is None:
+            continue
+        fit.cv_error = cross_validation_error(model, sizes, values)
+        fits.append(fit)
+
+    if criterion == 'aic':
+        fits.sort(key=lambda fit: fit.aic)
+    elif criterion == 'cv':
+        fits.sort(key=lambda fit: fit.cv_error)
+    else:
+        raise ValueError(f"Unknown criterion: {criterion}")
+    return fits
+
+def best_fit(sizes, values, criterion='aic'):
+    fits = fit_models(sizes, values, criterion)
+    if criterion != 'aic':
+        return fits[0]
+    close = [fit for fit in fits if fit.aic <= fits[0].aic + AIC_TOLERANCE]
+    return min(close, key=lambda fit: MODELS.index(fit.model))
+
+# Smallest integer n in [low, high] from which fit a predicts more than fit b, given that
+# a is not above b at low; None if that never happens in the range. high may lie beyond
+# the measured sizes to extrapolate
+def crossover_size(a, b, low, high):
+    def a_slower(n):
+        return a.predict(n) > b.predict(n)
+
+    if a_slower(low):
+        return None
+
+    # Geometric scan for the first bracket where the order flips, then bisect it
+    previous = low
+    n = low
+    while n < high:
+        n = min(high, max(n + 1, int(n * 1.05)))
+        if a_slower(n):
+            lo, hi = previous, n
+            while hi - lo > 1:
+                mid = (lo + hi) // 2
+                if a_slower(mid):
+                    hi = mid
+                else:
+                    lo = mid
+            return hi
+        previous = n
+    return None
+
+# Size at which the measured series a becomes slower than b, from the best model of each
+def crossover_point(sizes, a_values, b_values, high=None, criterion='aic'):
+    a = best_fit(sizes, a_values, criterion)
+    b = best_fit(sizes, b_values, criterion)
+    return crossover_size(a, b, min(sizes), high or max(sizes))
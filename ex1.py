@@ -1,57 +1,251 @@
-import sys
-sys.setrecursionlimit(20000)
-
-def merge_sort(arr, low, high):
-    if low < high:
-        mid = (low + high) // 2
-        merge_sort(arr, low, mid)
-        merge_sort(arr, mid+1, high)
-        merge(arr, low, mid, high)
-        
-def merge(arr, low, mid, high):
-    size_left = mid - low + 1
-    size_right = high - mid
+from bisect import bisect_left, bisect_right
+from sorting import insertion_sort
+from typed_arrays import copy_range, scratch_like
+from vectorized import is_ndarray, np_sort
+
+# Runs of this length are sorted with insertion sort before the merge passes start
+RUN_SIZE = 16
+
+# Consecutive wins by one run before the natural merge switches to galloping
+MIN_GALLOP = 7
+
+def merge_sort(arr, low, high, natural=False):
+    if is_ndarray(arr):
+        np_sort(arr[low:high + 1], kind='stable')
+        return
     
-    # Add elements into left and right subarrays
-    left_subarr = [0] * size_left
-    right_subarr = [0] * size_right
+    if natural:
+        natural_merge_sort(arr, low, high)
+        return
     
-    for i in range(0, size_left):
-        left_subarr[i] = arr[low + i]
-        
-    for j in range(0, size_right):
-        right_subarr[j] = arr[mid + 1 + j]
+    size = high - low + 1
+    if size < 2:
+        return
+    
+    # Sort short runs in place, then merge them bottom-up
+    for start in range(low, high + 1, RUN_SIZE):
+        insertion_sort(arr, start, min(start + RUN_SIZE - 1, high))
+    
+    # One scratch buffer for the whole sort, ping-ponging with arr
+    # (same representation as arr, so list, array('q') and memoryview input all stay as they are)
+    buffer = scratch_like(arr, size)
+    src, src_offset = arr, low
+    dst, dst_offset = buffer, 0
+    
+    width = RUN_SIZE
+    while width < size:
+        for start in range(0, size, 2 * width):
+            mid = min(start + width, size)
+            end = min(start + 2 * width, size)
+            merge(src, src_offset + start, src_offset + mid, src_offset + end, dst, dst_offset + start)
+        src, dst = dst, src
+        src_offset, dst_offset = dst_offset, src_offset
+        width *= 2
+    
+    # If the last pass landed in the buffer, copy it back
+    if src is not arr:
+        arr[low:high + 1] = src
         
-    # Merge subarrays
-    index_left = 0
-    index_right = 0
-    index_arr = low
+def merge(src, low, mid, high, dst, index_dst):
+    # Runs src[low:mid] and src[mid:high] are merged into dst starting at index_dst
     
-    while index_left < size_left and index_right < size_right:
-        if left_subarr[index_left] <= right_subarr[index_right]:
-            arr[index_arr] = left_subarr[index_left]
+    # Skip the merge if the two runs are already in order
+    if mid >= high or src[mid - 1] <= src[mid]:
+        dst[index_dst:index_dst + high - low] = src[low:high]
+        return
+    
+    # Merge runs
+    index_left = low
+    index_right = mid
+    
+    while index_left < mid and index_right < high:
+        if src[index_left] <= src[index_right]:
+            dst[index_dst] = src[index_left]
             index_left += 1
         else:
-            arr[index_arr] = right_subarr[index_right]
+            dst[index_dst] = src[index_right]
             index_right += 1
-        index_arr += 1
+        index_dst += 1
         
-    # If right_subarr is all done, finish left_subarr
-    while index_left < size_left:
-        arr[index_arr] = left_subarr[index_left]
-        index_left += 1
-        index_arr += 1
+    # Copy whichever run is left over in one slice
+    if index_left < mid:
+        dst[index_dst:index_dst + mid - index_left] = src[index_left:mid]
+    else:
+        dst[index_dst:index_dst + high - index_right] = src[index_right:high]
+
+
+# Adaptive (TimSort-style) mode: finds natural runs instead of splitting at the midpoint,
+# so nearly sorted input costs close to O(n)
+def natural_merge_sort(arr, low, high):
+    end = high + 1
+    size = end - low
+    if size < 2:
+        return
+    
+    min_run = compute_min_run(size)
+    run_base = []
+    run_len = []
+    
+    index = low
+    while index < end:
+        length = count_run(arr, index, end)
+        
+        # Pad short runs up to min_run with binary insertion
+        if length < min_run:
+            forced = min(min_run, end - index)
+            binary_insertion_sort(arr, index, index + forced, index + length)
+            length = forced
         
-    # If left_subarr is done, finish right_subarr
-    while index_right < size_right:
-        arr[index_arr] = right_subarr[index_right]
-        index_right += 1
-        index_arr += 1
+        run_base.append(index)
+        run_len.append(length)
+        merge_collapse(arr, run_base, run_len)
+        index += length
+    
+    # Merge whatever is left on the run stack
+    while len(run_len) > 1:
+        n = len(run_len) - 2
+        if n > 0 and run_len[n - 1] < run_len[n + 1]:
+            n -= 1
+        merge_at(arr, run_base, run_len, n)
+
+def compute_min_run(size):
+    # Keeps size / min_run close to (but no more than) a power of two
+    extra = 0
+    while size >= 64:
+        extra |= size & 1
+        size >>= 1
+    return size + extra
 
+def count_run(arr, low, end):
+    # Length of the run starting at low; a strictly descending run is reversed in place
+    index = low + 1
+    if index == end:
+        return 1
+    
+    if arr[index] < arr[low]:
+        index += 1
+        while index < end and arr[index] < arr[index - 1]:
+            index += 1
+        left, right = low, index - 1
+        while left < right:
+            arr[left], arr[right] = arr[right], arr[left]
+            left += 1
+            right -= 1
+    else:
+        index += 1
+        while index < end and not arr[index] < arr[index - 1]:
+            index += 1
+    
+    return index - low
 
+def binary_insertion_sort(arr, low, end, start):
+    # arr[low:start] is already sorted; insert arr[start:end] into it
+    for i in range(start, end):
+        key = arr[i]
+        pos = bisect_right(arr, key, low, i)
+        if pos < i:
+            arr[pos + 1:i + 1] = arr[pos:i]
+            arr[pos] = key
 
-arr = [8, 42, 25, 3, 3, 2, 27, 3]
+def merge_collapse(arr, run_base, run_len):
+    # Merge until the run lengths on the stack grow faster than Fibonacci numbers
+    while len(run_len) > 1:
+        n = len(run_len) - 2
+        if (n > 0 and run_len[n - 1] <= run_len[n] + run_len[n + 1]) or \
+                (n > 1 and run_len[n - 2] <= run_len[n - 1] + run_len[n]):
+            if run_len[n - 1] < run_len[n + 1]:
+                n -= 1
+        elif run_len[n] > run_len[n + 1]:
+            break
+        merge_at(arr, run_base, run_len, n)
 
-merge_sort(arr, 0, len(arr)-1)
+def merge_at(arr, run_base, run_len, n):
+    # Merge stack runs n and n+1 into one
+    base_left, len_left = run_base[n], run_len[n]
+    base_right, len_right = run_base[n + 1], run_len[n + 1]
+    
+    run_len[n] = len_left + len_right
+    del run_base[n + 1]
+    del run_len[n + 1]
+    
+    # Left elements <= the first right element are already in place
+    start = gallop_right(arr[base_right], arr, base_left, base_right)
+    len_left -= start - base_left
+    if len_left == 0:
+        return
+    
+    # Right elements >= the last left element are already in place
+    len_right = gallop_left(arr[start + len_left - 1], arr, base_right, base_right + len_right) - base_right
+    if len_right == 0:
+        return
+    
+    merge_galloping(arr, start, len_left, base_right, len_right)
 
-print(arr)
+def merge_galloping(arr, start, len_left, base_right, len_right):
+    left = copy_range(arr, start, start + len_left)
+    index_left = 0
+    index_right = base_right
+    end_right = base_right + len_right
+    index_arr = start
+    
+    while index_left < len_left and index_right < end_right:
+        wins_left = 0
+        wins_right = 0
+        
+        # One element at a time until one run keeps winning
+        while index_left < len_left and index_right < end_right:
+            if arr[index_right] < left[index_left]:
+                arr[index_arr] = arr[index_right]
+                index_right += 1
+                wins_right += 1
+                wins_left = 0
+            else:
+                arr[index_arr] = left[index_left]
+                index_left += 1
+                wins_left += 1
+                wins_right = 0
+            index_arr += 1
+            if wins_left >= MIN_GALLOP or wins_right >= MIN_GALLOP:
+                break
+        
+        if index_left == len_left or index_right == end_right:
+            break
+        
+        # Gallop: copy the whole winning stretch with one slice
+        if wins_left >= MIN_GALLOP:
+            stop = gallop_right(arr[index_right], left, index_left, len_left)
+            count = stop - index_left
+            arr[index_arr:index_arr + count] = left[index_left:stop]
+            index_left = stop
+        else:
+            stop = gallop_left(left[index_left], arr, index_right, end_right)
+            count = stop - index_right
+            arr[index_arr:index_arr + count] = arr[index_right:stop]
+            index_right = stop
+        index_arr += count
+    
+    # Leftover right elements are already in place
+    if index_left < len_left:
+        arr[index_arr:index_arr + len_left - index_left] = left[index_left:]
+
+def gallop_right(key, arr, low, high):
+    # First index in arr[low:high] holding a value > key, found by exponential search
+    offset = 1
+    while low + offset < high and not key < arr[low + offset - 1]:
+        offset *= 2
+    return bisect_right(arr, key, low + offset // 2, min(low + offset, high))
+
+def gallop_left(key, arr, low, high):
+    # First index in arr[low:high] holding a value >= key, found by exponential search
+    offset = 1
+    while low + offset < high and arr[low + offset - 1] < key:
+        offset *= 2
+    return bisect_left(arr, key, low + offset // 2, min(low + offset, high))
+
+
+if __name__ == "__main__":
+    arr = [8, 42, 25, 3, 3, 2, 27, 3]
+    
+    merge_sort(arr, 0, len(arr)-1)
+    
+    print(arr)
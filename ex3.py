@@ -1,24 +1,15 @@
 from matplotlib import pyplot as plt
 
-def bubble_sort(arr, len_arr, comp_arr, swap_arr):
+from instrumentation import instrument
+
+def bubble_sort(arr):
     n = len(arr)
-    comp = 0
-    swap = 0
     for i in range(n):
         for j in range(0, n-i-1):
             if arr[j] > arr[j+1]:
                 temp = arr[j]
                 arr[j] = arr[j+1]
                 arr[j+1] = temp
-                swap += 1
-            comp += 1
-        
-    print("Number of comparisons:", comp)
-    print("Number of swaps:", swap)
-    
-    len_arr.append(n)
-    comp_arr.append(comp)
-    swap_arr.append(swap)
     
     return arr
 
@@ -26,12 +17,21 @@ len_arr = []
 comp_arr = []
 swap_arr = []
 
-print(bubble_sort([], len_arr, comp_arr, swap_arr))
-print(bubble_sort([7,2,4], len_arr, comp_arr, swap_arr))
-print(bubble_sort([6,2,9,8,1], len_arr, comp_arr, swap_arr))
-print(bubble_sort([29,82,63,16,60,91,41], len_arr, comp_arr, swap_arr))
-print(bubble_sort([111,332,862,752,731,915,182,394,723], len_arr, comp_arr, swap_arr))
-print(bubble_sort([672,391,681,112,739,448,922,614,829,459,392], len_arr, comp_arr, swap_arr))
+# Comparisons and swaps are counted by the shared instrumentation layer, so the sort
+# itself carries no counters
+for arr in [[], [7,2,4], [6,2,9,8,1], [29,82,63,16,60,91,41],
+            [111,332,862,752,731,915,182,394,723],
+            [672,391,681,112,739,448,922,614,829,459,392]]:
+    counts = instrument(bubble_sort, arr)
+    
+    print("Number of comparisons:", counts.comparisons)
+    print("Number of swaps:", counts.swaps)
+    
+    len_arr.append(len(arr))
+    comp_arr.append(counts.comparisons)
+    swap_arr.append(counts.swaps)
+    
+    print(arr)
 
 plt.plot(len_arr, comp_arr)
 plt.title("Comparisons to Length")
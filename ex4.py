@@ -1,51 +1,20 @@
 import sys
-import time
 import matplotlib.pyplot as plt
 import numpy as np
 
-# Set recursion limit to avoid issues with quicksort
-sys.setrecursionlimit(20000)
+from benchmark import measure_sort
+from complexity import best_fit
+from instrumentation import instrument
+from sorting import introsort
+from typed_arrays import copy_array, memory_bytes, representation_from_args, to_representation
 
-# Quicksort implementation with counter for number of comparisons
-def quicksort(arr, low=0, high=None, comparisons=None):
-    if comparisons is None:
-        comparisons = [0]  # Use list to allow modification within nested functions
-    
-    if high is None:
-        high = len(arr) - 1
-    
-    if low < high:
-        # Partition the array
-        pivot_index = partition(arr, low, high, comparisons)
-        
-        # Sort elements before and after the pivot
-        quicksort(arr, low, pivot_index - 1, comparisons)
-        quicksort(arr, pivot_index + 1, high, comparisons)
-    
-    return arr, comparisons[0]
-
-def partition(arr, low, high, comparisons):
-    # Select the rightmost element as pivot
-    pivot = arr[high]
-    
-    # Index of smaller element
-    i = low - 1
-    
-    for j in range(low, high):
-        # Count comparison
-        comparisons[0] += 1
-        
-        # If current element is smaller than or equal to pivot
-        if arr[j] <= pivot:
-            # Increment index of smaller element
-            i += 1
-            arr[i], arr[j] = arr[j], arr[i]
-    
-    # Place pivot in its correct position
-    arr[i + 1], arr[high] = arr[high], arr[i + 1]
-    return i + 1
+# Quicksort (introsort engine from sorting.py). Comparisons are counted from outside
+# with instrumentation.instrument, so the timed runs carry no counting overhead
+def quicksort(arr, low=0, high=None):
+    return introsort(arr, low, high)
 
-# Generate worst-case input for quicksort (already sorted array with last element as pivot)
+# Generate worst-case input for a last-element-pivot quicksort (already sorted array);
+# the introsort engine handles it in O(n log n)
 def generate_worst_case(size):
     return list(range(size))
 
@@ -81,10 +50,16 @@ def visualize_manual_quicksort():
     resulting in a total of n-1 partitioning operations, each requiring O(n) comparisons.
     
     This process continues until we reach the base case, resulting in O(n²) complexity.
+    
+    Note: this walkthrough is for the textbook last-element-pivot quicksort. The quicksort()
+    in this file uses the introsort engine from sorting.py instead, which would take the
+    median-of-three (7) as the first pivot and split the array in half; at 16 elements it
+    does not partition at all but finishes with a single insertion sort pass (15 comparisons
+    on sorted input). Neither path does the n-1 partitioning steps shown above.
     """
 
 # Test function for measuring quicksort performance on worst-case inputs
-def test_quicksort_worst_case(sizes):
+def test_quicksort_worst_case(sizes, representation='list'):
     comparisons_list = []
     times_list = []
     
@@ -92,12 +67,16 @@ def test_quicksort_worst_case(sizes):
         print(f"Testing with size: {size}")
         
         # Generate worst-case input
-        arr = generate_worst_case(size)
+        arr = to_representation(generate_worst_case(size), representation)
         
-        # Measure time and count comparisons
-        start_time = time.time()
-        _, comparisons = quicksort(arr.copy())
-        elapsed_time = time.time() - start_time
+        # Count comparisons on one run, then time repeated runs on identical copies
+        counts = instrument(quicksort, copy_array(arr))
+        comparisons = counts.comparisons
+        print(f"Quicksort operations: {counts}")
+        measurement = measure_sort(quicksort, arr)
+        elapsed_time = measurement.seconds
+        print(f"Quicksort: {measurement}")
+        print(f"Input memory ({representation}): {memory_bytes(arr)} bytes")
         
         comparisons_list.append(comparisons)
         times_list.append(elapsed_time)
@@ -113,11 +92,11 @@ def plot_results(sizes, comparisons, times):
     plt.title('Number of Comparisons in Quicksort (Worst Case)')
     plt.plot(sizes, comparisons, 'bo-', label='Measured Comparisons')
     
-    # Fit quadratic function (O(n²))
-    coeff = np.polyfit(sizes, comparisons, 2)
-    poly = np.poly1d(coeff)
+    # Fit every complexity model and keep the best one (AICc)
+    fit = best_fit(sizes, comparisons)
     x = np.linspace(min(sizes), max(sizes), 100)
-    plt.plot(x, poly(x), 'r-', label=f'O(n²) fit: {coeff[0]:.2e}n² + {coeff[1]:.2e}n + {coeff[2]:.2e}')
+    plt.plot(x, [fit.predict(n) for n in x], 'r-', label=f'Best fit {fit}')
+    print(f"Comparisons: {fit}")
     
     plt.xlabel('Input Size (n)')
     plt.ylabel('Number of Comparisons')
@@ -129,10 +108,9 @@ def plot_results(sizes, comparisons, times):
     plt.title('Execution Time of Quicksort (Worst Case)')
     plt.plot(sizes, times, 'go-', label='Measured Time')
     
-    # Fit quadratic function (O(n²))
-    coeff = np.polyfit(sizes, times, 2)
-    poly = np.poly1d(coeff)
-    plt.plot(x, poly(x), 'r-', label=f'O(n²) fit: {coeff[0]:.2e}n² + {coeff[1]:.2e}n + {coeff[2]:.2e}')
+    fit = best_fit(sizes, times)
+    plt.plot(x, [fit.predict(n) for n in x], 'r-', label=f'Best fit {fit}')
+    print(f"Time: {fit}")
     
     plt.xlabel('Input Size (n)')
     plt.ylabel('Time (seconds)')
@@ -150,7 +128,8 @@ if __name__ == "__main__":
     
     # Test with various input sizes
     sizes = [100, 200, 300, 400, 500, 750, 1000, 1250, 1500, 1750, 2000]
-    comparisons, times = test_quicksort_worst_case(sizes)
+    # Pass --representation array|memoryview|numpy to run on packed int64 buffers instead of lists
+    comparisons, times = test_quicksort_worst_case(sizes, representation_from_args(sys.argv))
     
     # Plot results
     plot_results(sizes, comparisons, times)
@@ -204,4 +183,10 @@ if __name__ == "__main__":
     This analysis highlights the importance of good pivot selection strategies in quicksort
     implementations, such as median-of-three or randomized pivot selection, which make this
     worst-case scenario much less likely to occur in practice.
+    
+    The quicksort above now runs on the shared introsort engine in sorting.py, which uses
+    median-of-three / ninther pivots, falls back to heapsort past 2*log2(n) levels and
+    finishes small partitions with insertion sort, so sorted input stays O(n log n).
+    The plots therefore no longer assume a quadratic: each series is fitted with O(1), O(log n),
+    O(n), O(n log n), O(n²) and power-law models and the best one by AICc is drawn.
     """
\ No newline at end of file
@@ -3,11 +3,15 @@
 # when the array length is larger. This is because binary searching
 # works best on a mostly sorted array, which is not necessarily the case
 # in an average case scenario with random ordering.
+#
+# Most of that gap came from binary_insertion_sort rebuilding the whole
+# list with four slices for every element. It now shifts in place with
+# one slice assignment, and block mode inserts sorted batches at once.
 
-import sys
-import timeit
 from matplotlib import pyplot as plt
-sys.setrecursionlimit(20000)
+from benchmark import measure_sort
+from sorting import insertion_sort as insertion_sort_range
+from typed_arrays import copy_range
 
 # Implementing insertion sort
 def insertion_sort(arr):
@@ -18,81 +22,97 @@ def insertion_sort(arr):
             arr[j + 1] = arr[j]
             j -= 1
         arr[j + 1] = key
-    print(arr)
 
 # Implementing binary insertion sort
+# Returns the insertion point for key in the sorted arr[start..end], after any
+# equal elements so the sort stays stable
 def binary_search(arr, key, start, end):
-    if start == end:
-        if arr[start] > key:
-            return start
+    while start <= end:
+        mid = (start + end) // 2
+        if arr[mid] <= key:
+            start = mid + 1
         else:
-            return start + 1
-    
-    if start > end:
-        return start
-    
-    mid = (start + end) // 2
-    if arr[mid] < key:
-        return binary_search(arr, key, mid+1, end)
-    elif arr[mid] > key:
-        return binary_search(arr, key, start, mid-1)
-    else:
-        return mid
+            end = mid - 1
+    return start
 
-def binary_insertion_sort(arr):
+# block_size > 1 takes the next block_size elements at a time, sorts them, and
+# inserts the whole sorted batch into the sorted prefix with a single slice write
+def binary_insertion_sort(arr, block_size=1):
+    if block_size > 1:
+        binary_insertion_sort_blocks(arr, block_size)
+        return
+    
     for i in range(1, len(arr)):
         key = arr[i]
         j = binary_search(arr, key, 0, i-1)
-        arr = arr[:j] + [key] + arr[j:i] + arr[i+1:]
-    print(arr)
+        if j < i:
+            # Shift arr[j..i-1] right by one in place
+            arr[j+1:i+1] = arr[j:i]
+            arr[j] = key
 
-len_arr = [4, 5, 7, 8, 10, 12, 15]
-insert_times = []
-bin_times = []
-
-isetup = 'from __main__ import insertion_sort'
-bsetup = 'from __main__ import binary_insertion_sort'
+def binary_insertion_sort_blocks(arr, block_size):
+    i = 1
+    while i < len(arr):
+        end = min(i + block_size, len(arr))
+        block = copy_range(arr, i, end)
+        insertion_sort_range(block, 0, len(block) - 1)
+        
+        # Each key in the sorted block lands at or after the previous one,
+        # so every search starts where the last one ended
+        first = prev = binary_search(arr, block[0], 0, i-1)
+        merged = []
+        for key in block:
+            pos = binary_search(arr, key, prev, i-1)
+            merged.extend(arr[prev:pos])
+            merged.append(key)
+            prev = pos
+        merged.extend(arr[prev:i])
+        
+        # array('q') and memoryview slices only take their own type, so those are
+        # written back element by element
+        if isinstance(arr, list):
+            arr[first:end] = merged
+        else:
+            for k, value in enumerate(merged, first):
+                arr[k] = value
+        i = end
 
-i4 = 'insertion_sort([62,13,81,24])'
-i5 = 'insertion_sort([92,12,47,53,28])'
-i7 = 'insertion_sort([73,91,13,42,27,34,56])'
-i8 = 'insertion_sort([63,29,51,81,69,47,19,33])'
-i10 = 'insertion_sort([532,823,645,136,639,239,836,534,341,729])'
-i12 = 'insertion_sort([562,913,612,123,832,724,327,539,823,283,901,734])'
-i15 = 'insertion_sort([613,813,173,931,471,209,816,953,351,293,492,592,284,682,520])'
+arrays = [
+    [62,13,81,24],
+    [92,12,47,53,28],
+    [73,91,13,42,27,34,56],
+    [63,29,51,81,69,47,19,33],
+    [532,823,645,136,639,239,836,534,341,729],
+    [562,913,612,123,832,724,327,539,823,283,901,734],
+    [613,813,173,931,471,209,816,953,351,293,492,592,284,682,520],
+]
+len_arr = [len(arr) for arr in arrays]
 
-b4 = 'binary_insertion_sort([62,13,81,24])'
-b5 = 'binary_insertion_sort([92,12,47,53,28])'
-b7 = 'binary_insertion_sort([73,91,13,42,27,34,56])'
-b8 = 'binary_insertion_sort([63,29,51,81,69,47,19,33])'
-b10 = 'binary_insertion_sort([532,823,645,136,639,239,836,534,341,729])'
-b12 = 'binary_insertion_sort([562,913,612,123,832,724,327,539,823,283,901,734])'
-b15 = 'binary_insertion_sort([613,813,173,931,471,209,816,953,351,293,492,592,284,682,520])'
+# The sorts no longer print, since they run many times below; show each result once
+for arr in arrays:
+    result = list(arr)
+    binary_insertion_sort(result)
+    print(result)
 
-insert_times.append(timeit.timeit(setup=isetup, stmt=i4, number=1))
-insert_times.append(timeit.timeit(setup=isetup, stmt=i5, number=1))
-insert_times.append(timeit.timeit(setup=isetup, stmt=i7, number=1))
-insert_times.append(timeit.timeit(setup=isetup, stmt=i8, number=1))
-insert_times.append(timeit.timeit(setup=isetup, stmt=i10, number=1))
-insert_times.append(timeit.timeit(setup=isetup, stmt=i12, number=1))
-insert_times.append(timeit.timeit(setup=isetup, stmt=i15, number=1))
+# Median of repeated runs, each sorting a fresh copy of the same array
+insert_times = [measure_sort(insertion_sort, arr).seconds for arr in arrays]
+bin_times = [measure_sort(binary_insertion_sort, arr).seconds for arr in arrays]
 
-bin_times.append(timeit.timeit(setup=bsetup, stmt=b4, number=1))
-bin_times.append(timeit.timeit(setup=bsetup, stmt=b5, number=1))
-bin_times.append(timeit.timeit(setup=bsetup, stmt=b7, number=1))
-bin_times.append(timeit.timeit(setup=bsetup, stmt=b8, number=1))
-bin_times.append(timeit.timeit(setup=bsetup, stmt=b10, number=1))
-bin_times.append(timeit.timeit(setup=bsetup, stmt=b12, number=1))
-bin_times.append(timeit.timeit(setup=bsetup, stmt=b15, number=1))
+# Block mode: insert sorted batches of 4 elements at a time
+block_times = [measure_sort(binary_insertion_sort, arr, 4).seconds for arr in arrays]
 
 for i in range(len(insert_times)):
     insert_times[i] *= 1000
     
 for i in range(len(bin_times)):
     bin_times[i] *= 1000
+
+for i in range(len(block_times)):
+    block_times[i] *= 1000
     
 plt.plot(len_arr, insert_times, color='r', label='Insertion times')
 plt.plot(len_arr, bin_times, color='b', label='Binary insertion times')
+plt.plot(len_arr, block_times, color='g', label='Block binary insertion times')
 plt.legend()
 
 plt.xlabel('Array Length')
@@ -7,12 +7,17 @@
 # then have to search next, especially if we then cut the array in half
 # every time afterwards.
 
-import timeit
-import json
+import os
+from array import array
 from matplotlib import pyplot as plt
 from math import ceil
 import random
 
+from benchmark import measure
+from json_stream import iter_json_integers, load_array
+from searching import batch_binary_search, interpolation_search
+from sorted_index import SortedIndex, build_index
+
 def binary_search(arr, key, midpoints):
     low = 0
     high = len(arr) - 1
@@ -40,33 +45,57 @@ def binary_search(arr, key, midpoints):
     
     return -1
 
-with open('ex7data.json', 'r', encoding='UTF-8') as file:
-    data = json.load(file)
-    
-with open('ex7tasks.json', 'r', encoding='UTF-8') as file:
-    tasks = json.load(file)
+if __name__ == "__main__":
+    # Use the memory-mapped index if it has been built
+    # (python sorted_index.py ex7data.json ex7data.idx), otherwise stream the JSON
+    # into a packed int64 array. An index older than the JSON is rebuilt first
+    index = None
+    if os.path.exists('ex7data.idx'):
+        if os.path.exists('ex7data.json') and os.path.getmtime('ex7data.idx') < os.path.getmtime('ex7data.json'):
+            build_index('ex7data.json', 'ex7data.idx')
+        index = SortedIndex('ex7data.idx')
+        data = index.data
+    else:
+        data = load_array('ex7data.json')
+
+    tasks = array('q')
+    midpoints = []
+    times = []
+
+    # Tasks are searched as they are parsed, without loading the whole file first
+    for i in iter_json_integers('ex7tasks.json'):
+        tasks.append(i)
+        binary_search(data, i, midpoints)
+        # Repeated runs append their midpoints to a scratch list instead
+        times.append(measure(binary_search, data, i, []).median / 1000)
+
+    # Answer the whole task list with one batched lookup for comparison
+    batch = measure(batch_binary_search, data, tasks)
+    print(f"Per-key searches: {sum(times):.1f} microseconds, batched search: {batch.median / 1000:.1f} microseconds ({batch})")
 
-midpoints = []
-times = []
+    # Interpolation-binary hybrid: number of probes each lookup took
+    probes = [interpolation_search(data, i)[1] for i in tasks]
+    print(f"Hybrid search: {sum(probes) / len(probes):.2f} probes on average, {max(probes)} at most")
 
-for i in tasks:
-    times.append(timeit.timeit(setup='from __main__ import binary_search, data, i, midpoints',
-                                stmt='binary_search(data, i, midpoints)',
-                                number=1))
+    # Plotting Time vs Tasks
+    plt.subplot(1, 3, 1)
+    plt.scatter(tasks, times)
+    plt.xlabel("Tasks")
+    plt.ylabel("Time (microseconds)")
 
-for i in range(len(times)):
-    times[i] *= 1000000
+    # Plotting Midpoints vs Tasks
+    plt.subplot(1, 3, 2)
+    plt.scatter(tasks, midpoints)
+    plt.xlabel("Tasks")
+    plt.ylabel("Starting Midpoint")
 
-# Plotting Time vs Tasks
-plt.subplot(1, 2, 1)
-plt.scatter(tasks, times)
-plt.xlabel("Tasks")
-plt.ylabel("Time (microseconds)")
+    # Plotting Hybrid Search Probes vs Tasks
+    plt.subplot(1, 3, 3)
+    plt.scatter(tasks, probes)
+    plt.xlabel("Tasks")
+    plt.ylabel("Hybrid Search Probes")
 
-# Plotting Midpoints vs Tasks
-plt.subplot(1, 2, 2)
-plt.scatter(tasks, midpoints)
-plt.xlabel("Tasks")
-plt.ylabel("Starting Midpoint")
+    plt.show()
 
-plt.show()
\ No newline at end of file
+    if index is not None:
+        index.close()
\ No newline at end of file
@@ -1,14 +1,19 @@
 import sys
-import time
 import random
 import matplotlib.pyplot as plt
 import numpy as np
 
-# Set recursion limit to avoid issues with quicksort
-sys.setrecursionlimit(20000)
+from benchmark import measure_sort
+from complexity import best_fit, crossover_point, crossover_size
+from sorting import auto_sort, introsort
+from typed_arrays import memory_bytes, representation_from_args, to_representation
+from vectorized import is_ndarray, np_sort
 
 # Bubble Sort implementation
 def bubble_sort(arr):
+    if is_ndarray(arr):
+        return np_sort(arr, kind='stable')
+    
     n = len(arr)
     for i in range(n):
         # Flag to optimize bubble sort
@@ -22,38 +27,10 @@ def bubble_sort(arr):
             break
     return arr
 
-# Quicksort implementation
-def quicksort(arr, low=0, high=None):
-    if high is None:
-        high = len(arr) - 1
-    
-    if low < high:
-        # Partition the array
-        pivot_index = partition(arr, low, high)
-        
-        # Sort elements before and after the pivot
-        quicksort(arr, low, pivot_index - 1)
-        quicksort(arr, pivot_index + 1, high)
-    
-    return arr
-
-def partition(arr, low, high):
-    # Select the rightmost element as pivot
-    pivot = arr[high]
-    
-    # Index of smaller element
-    i = low - 1
-    
-    for j in range(low, high):
-        # If current element is smaller than or equal to pivot
-        if arr[j] <= pivot:
-            # Increment index of smaller element
-            i += 1
-            arr[i], arr[j] = arr[j], arr[i]
-    
-    # Place pivot in its correct position
-    arr[i + 1], arr[high] = arr[high], arr[i + 1]
-    return i + 1
+# Quicksort implementation (introsort engine from sorting.py, O(n log n) on sorted input)
+# three_way=True uses 3-way partitioning, which keeps duplicate-heavy input fast
+def quicksort(arr, low=0, high=None, three_way=False):
+    return introsort(arr, low, high, three_way)
 
 # Generate different test cases
 def generate_best_case_bubble(size):
@@ -68,8 +45,12 @@ def generate_average_case(size):
     # Random array (average case for both algorithms)
     return random.sample(range(size*10), size)
 
-# Test function
-def test_sorting_algorithms(sizes):
+def generate_duplicate_heavy(size, distinct=8):
+    # Random array drawn from only a few distinct keys (like low-cardinality status codes)
+    return [random.randrange(distinct) for _ in range(size)]
+
+# Test function (representation picks list, array, memoryview or numpy input, see typed_arrays.py)
+def test_sorting_algorithms(sizes, representation='list'):
     # Dictionary to store results
     results = {
         'bubble_best': [],
@@ -77,7 +58,11 @@ def test_sorting_algorithms(sizes):
         'bubble_avg': [],
         'quick_best': [],
         'quick_worst': [],
-        'quick_avg': []
+        'quick_avg': [],
+        'quick_dup': [],
+        'quick3_dup': [],
+        'auto_avg': [],
+        'auto_dup': []
     }
     
     for size in sizes:
@@ -85,51 +70,54 @@ def test_sorting_algorithms(sizes):
         
         # Best case for bubble sort (already sorted)
         arr = generate_best_case_bubble(size)
+        arr = to_representation(arr, representation)
         
         # Test bubble sort on best case
-        start_time = time.time()
-        bubble_sort(arr.copy())
-        results['bubble_best'].append(time.time() - start_time)
+        results['bubble_best'].append(measure_sort(bubble_sort, arr).seconds)
         
         # Test quicksort on same array (note: this could be worst case for some quicksort implementations)
-        start_time = time.time()
-        quicksort(arr.copy())
-        results['quick_best'].append(time.time() - start_time)
+        results['quick_best'].append(measure_sort(quicksort, arr).seconds)
         
         # Worst case for bubble sort (reverse sorted)
         arr = generate_worst_case_bubble(size)
+        arr = to_representation(arr, representation)
         
         # Test bubble sort on worst case
-        start_time = time.time()
-        bubble_sort(arr.copy())
-        results['bubble_worst'].append(time.time() - start_time)
+        results['bubble_worst'].append(measure_sort(bubble_sort, arr).seconds)
         
         # Test quicksort on same array
-        start_time = time.time()
-        quicksort(arr.copy())
-        results['quick_worst'].append(time.time() - start_time)
+        results['quick_worst'].append(measure_sort(quicksort, arr).seconds)
         
         # Average case (random array)
         arr = generate_average_case(size)
+        arr = to_representation(arr, representation)
         
         # Test bubble sort on average case
-        start_time = time.time()
-        bubble_sort(arr.copy())
-        results['bubble_avg'].append(time.time() - start_time)
+        results['bubble_avg'].append(measure_sort(bubble_sort, arr).seconds)
         
         # Test quicksort on same array
-        start_time = time.time()
-        quicksort(arr.copy())
-        results['quick_avg'].append(time.time() - start_time)
+        results['quick_avg'].append(measure_sort(quicksort, arr).seconds)
+        
+        # Non-comparison sorts where the key range allows (auto_sort falls back to introsort)
+        results['auto_avg'].append(measure_sort(auto_sort, arr).seconds)
+        
+        # Duplicate-heavy case (few distinct keys): 2-way vs 3-way partitioning
+        arr = to_representation(generate_duplicate_heavy(size), representation)
+        
+        results['quick_dup'].append(measure_sort(quicksort, arr).seconds)
+        results['quick3_dup'].append(measure_sort(lambda a: quicksort(a, three_way=True), arr).seconds)
+        results['auto_dup'].append(measure_sort(auto_sort, arr).seconds)
+        
+        print(f"Input memory ({representation}): {memory_bytes(arr)} bytes")
     
     return results
 
 # Plot results
 def plot_results(sizes, results):
-    plt.figure(figsize=(15, 15))
+    plt.figure(figsize=(15, 20))
     
     # Best case
-    plt.subplot(3, 1, 1)
+    plt.subplot(4, 1, 1)
     plt.title('Best Case')
     plt.plot(sizes, results['bubble_best'], 'b-', label='Bubble Sort')
     plt.plot(sizes, results['quick_best'], 'r-', label='Quicksort')
@@ -138,16 +126,13 @@ def plot_results(sizes, results):
     plt.legend()
     plt.grid(True)
     
-    # Find crossover point
-    crossover = None
-    for i in range(len(sizes)-1):
-        if results['bubble_best'][i] <= results['quick_best'][i] and results['bubble_best'][i+1] > results['quick_best'][i+1]:
-            crossover = sizes[i]
-            plt.axvline(x=crossover, color='g', linestyle='--', label=f'Crossover at {crossover}')
-            break
+    # Size where bubble sort's fitted curve rises above quicksort's
+    crossover = crossover_point(sizes, results['bubble_best'], results['quick_best'])
+    if crossover:
+        plt.axvline(x=crossover, color='g', linestyle='--', label=f'Crossover at {crossover}')
     
     # Worst case
-    plt.subplot(3, 1, 2)
+    plt.subplot(4, 1, 2)
     plt.title('Worst Case')
     plt.plot(sizes, results['bubble_worst'], 'b-', label='Bubble Sort')
     plt.plot(sizes, results['quick_worst'], 'r-', label='Quicksort')
@@ -156,31 +141,37 @@ def plot_results(sizes, results):
     plt.legend()
     plt.grid(True)
     
-    # Find crossover point
-    crossover = None
-    for i in range(len(sizes)-1):
-        if results['bubble_worst'][i] <= results['quick_worst'][i] and results['bubble_worst'][i+1] > results['quick_worst'][i+1]:
-            crossover = sizes[i]
-            plt.axvline(x=crossover, color='g', linestyle='--', label=f'Crossover at {crossover}')
-            break
+    # Size where bubble sort's fitted curve rises above quicksort's
+    crossover = crossover_point(sizes, results['bubble_worst'], results['quick_worst'])
+    if crossover:
+        plt.axvline(x=crossover, color='g', linestyle='--', label=f'Crossover at {crossover}')
     
     # Average case
-    plt.subplot(3, 1, 3)
+    plt.subplot(4, 1, 3)
     plt.title('Average Case')
     plt.plot(sizes, results['bubble_avg'], 'b-', label='Bubble Sort')
     plt.plot(sizes, results['quick_avg'], 'r-', label='Quicksort')
+    plt.plot(sizes, results['auto_avg'], 'c-', label='Radix/counting sort (auto)')
     plt.xlabel('Input Size')
     plt.ylabel('Time (seconds)')
     plt.legend()
     plt.grid(True)
     
-    # Find crossover point
-    crossover = None
-    for i in range(len(sizes)-1):
-        if results['bubble_avg'][i] <= results['quick_avg'][i] and results['bubble_avg'][i+1] > results['quick_avg'][i+1]:
-            crossover = sizes[i]
-            plt.axvline(x=crossover, color='g', linestyle='--', label=f'Crossover at {crossover}')
-            break
+    # Size where bubble sort's fitted curve rises above quicksort's
+    crossover = crossover_point(sizes, results['bubble_avg'], results['quick_avg'])
+    if crossover:
+        plt.axvline(x=crossover, color='g', linestyle='--', label=f'Crossover at {crossover}')
+    
+    # Duplicate-heavy case
+    plt.subplot(4, 1, 4)
+    plt.title('Duplicate-Heavy Case (8 distinct keys)')
+    plt.plot(sizes, results['quick_dup'], 'r-', label='Quicksort (2-way partition)')
+    plt.plot(sizes, results['quick3_dup'], 'm-', label='Quicksort (3-way partition)')
+    plt.plot(sizes, results['auto_dup'], 'c-', label='Counting sort (auto)')
+    plt.xlabel('Input Size')
+    plt.ylabel('Time (seconds)')
+    plt.legend()
+    plt.grid(True)
     
     plt.tight_layout()
     plt.savefig('sorting_performance.png')
@@ -191,31 +182,35 @@ if __name__ == "__main__":
     # 20 different sizes, focusing on small arrays to find the threshold
     sizes = [10, 20, 30, 40, 50, 75, 100, 150, 200, 250, 300, 400, 500, 750, 1000, 1500, 2000, 3000, 5000, 10000]
     
-    results = test_sorting_algorithms(sizes)
+    # Pass --representation array|memoryview|numpy to run on packed int64 buffers
+    # instead of lists (--vectorized is shorthand for numpy)
+    representation = representation_from_args(sys.argv)
+    results = test_sorting_algorithms(sizes, representation)
     plot_results(sizes, results)
     
-    # Find the threshold where quicksort becomes faster than bubble sort
-    # For average case (most common scenario)
-    threshold = None
-    for i in range(len(sizes)-1):
-        if results['bubble_avg'][i] <= results['quick_avg'][i] and results['bubble_avg'][i+1] > results['quick_avg'][i+1]:
-            threshold = sizes[i]
-            break
+    # With a fixed number of distinct keys, 3-way quicksort should cost about the same per element at every size
+    per_element = [t / n for t, n in zip(results['quick3_dup'], sizes)]
+    print(f"3-way quicksort on duplicate-heavy input: {per_element[0] * 1e6:.3f} microseconds per element "
+          f"at size {sizes[0]}, {per_element[-1] * 1e6:.3f} at size {sizes[-1]}")
+    
+    # Find the threshold where quicksort becomes faster than bubble sort from the best-fitting
+    # complexity model of each (average case, the most common scenario)
+    bubble_fit = best_fit(sizes, results['bubble_avg'])
+    quick_fit = best_fit(sizes, results['quick_avg'])
+    print(f"Average case fits: bubble sort {bubble_fit}, quicksort {quick_fit}")
+    threshold = crossover_size(bubble_fit, quick_fit, sizes[0], sizes[-1])
     
     if threshold:
         print(f"Based on average case performance, the threshold where quicksort becomes faster than bubble sort is around {threshold} elements.")
+    elif bubble_fit.predict(sizes[-1]) <= quick_fit.predict(sizes[-1]):
+        print("Bubble sort is consistently faster than quicksort for all tested sizes in the average case.")
     else:
-        # If no crossover point was found, check if one algorithm is always faster
-        if all(b <= q for b, q in zip(results['bubble_avg'], results['quick_avg'])):
-            print("Bubble sort is consistently faster than quicksort for all tested sizes in the average case.")
-        elif all(b >= q for b, q in zip(results['bubble_avg'], results['quick_avg'])):
-            print("Quicksort is consistently faster than bubble sort for all tested sizes in the average case.")
-        else:
-            # Find the first size where quicksort is faster
-            for i in range(len(sizes)):
-                if results['bubble_avg'][i] > results['quick_avg'][i]:
-                    print(f"Based on average case performance, quicksort becomes faster than bubble sort at around {sizes[i]} elements.")
-                    break
+        print("Quicksort is consistently faster than bubble sort for all tested sizes in the average case.")
+    
+    # Extrapolate to a production-sized input
+    production_size = 1000000
+    print(f"Predicted average case time at {production_size} elements: bubble sort "
+          f"{bubble_fit.predict(production_size):.1f} s, quicksort {quick_fit.predict(production_size):.3f} s")
 
     """
     Discussion of results:
@@ -242,4 +237,10 @@ if __name__ == "__main__":
     
     The threshold of 50 is chosen conservatively to ensure good performance across various types of input
     data while allowing for some variance in hardware performance.
+    
+    Correction to point 2: quicksort here runs on the shared introsort engine in sorting.py, whose
+    median-of-three / ninther pivots, heapsort fallback past 2*log2(n) levels and insertion sort for
+    small partitions keep it O(n log n) on sorted, reversed and duplicate-heavy input. It no longer
+    has an O(n²) worst case to hit, so bubble sort loses to it in the worst case by a growing
+    asymptotic margin, not just by constant factors.
     """
\ No newline at end of file
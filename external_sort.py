@@ -0,0 +1,113 @@
+import argparse
+import heapq
+import os
+import tempfile
+from array import array
+
+from ex1 import merge_sort
+from json_stream import iter_json_integers
+from sorting import auto_sort, introsort
+
+# Rough in-memory cost of one int in a Python list (8-byte pointer + int object)
+BYTES_PER_ELEMENT = 36
+
+# Values read back from each run file per refill
+RUN_BLOCK = 8192
+
+# Sort the integers in input_path (one per line, or a JSON array such as ex7data.json)
+# into output_path without holding more than about memory_limit bytes of values at once.
+# Sorted runs are spilled as int64 binary files and merged fan_in at a time with a
+# heap-based k-way merge. output_format is 'text' (one per line) or 'binary' (int64)
+def external_sort(input_path, output_path, memory_limit=64 << 20, fan_in=16,
+                  algorithm='quick', output_format='text'):
+    chunk_size = max(1, memory_limit // BYTES_PER_ELEMENT)
+    if fan_in < 2:
+        raise ValueError("fan_in must be at least 2")
+
+    with tempfile.TemporaryDirectory() as spill_dir:
+        runs = []
+        chunk = []
+        for value in iter_json_integers(input_path):
+            chunk.append(value)
+            if len(chunk) == chunk_size:
+                runs.append(spill_run(chunk, spill_dir, len(runs), algorithm))
+                chunk = []
+        if chunk or not runs:
+            runs.append(spill_run(chunk, spill_dir, len(runs), algorithm))
+        chunk = None
+
+        # Intermediate passes until one final merge can take every run
+        generation = 0
+        while len(runs) > fan_in:
+            generation += 1
+            merged_runs = []
+            for start in range(0, len(runs), fan_in):
+                group = runs[start:start + fan_in]
+                path = os.path.join(spill_dir, f"merge{generation}_{len(merged_runs)}.bin")
+                with open(path, 'wb') as file:
+                    write_binary(heapq.merge(*[read_run(run) for run in group]), file)
+                for run in group:
+                    os.remove(run)
+                merged_runs.append(path)
+            runs = merged_runs
+
+        merged = heapq.merge(*[read_run(run) for run in runs])
+        if output_format == 'binary':
+            with open(output_path, 'wb') as file:
+                write_binary(merged, file)
+        elif output_format == 'text':
+            with open(output_path, 'w', encoding='UTF-8') as file:
+                for value in merged:
+                    file.write(f"{value}\n")
+        else:
+            raise ValueError(f"Unknown output format: {output_format}")
+
+def spill_run(chunk, spill_dir, number, algorithm):
+    if algorithm == 'merge':
+        merge_sort(chunk, 0, len(chunk) - 1)
+    elif algorithm == 'quick':
+        introsort(chunk)
+    elif algorithm == 'auto':
+        auto_sort(chunk)
+    else:
+        raise ValueError(f"Unknown algorithm: {algorithm}")
+
+    path = os.path.join(spill_dir, f"run{number}.bin")
+    with open(path, 'wb') as file:
+        array('q', chunk).tofile(file)
+    return path
+
+# Stream the int64 values of a run file back, RUN_BLOCK values at a time
+def read_run(path):
+    with open(path, 'rb') as file:
+        while True:
+            block = array('q')
+            try:
+                block.fromfile(file, RUN_BLOCK)
+            except EOFError:
+                # fromfile keeps the values it did read before hitting the end
+                yield from block
+                return
+            yield from block
+
+def write_binary(values, file):
+    block = array('q')
+    for value in values:
+        block.append(value)
+        if len(block) == RUN_BLOCK:
+            block.tofile(file)
+            block = array('q')
+    block.tofile(file)
+
+# Usage: python external_sort.py ex7data.json sorted.txt --memory-limit 67108864 --fan-in 16
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sort a file of integers larger than RAM")
+    parser.add_argument('input')
+    parser.add_argument('output')
+    parser.add_argument('--memory-limit', type=int, default=64 << 20, help="bytes of values held in memory")
+    parser.add_argument('--fan-in', type=int, default=16, help="runs merged per pass")
+    parser.add_argument('--algorithm', choices=['quick', 'merge', 'auto'], default='quick')
+    parser.add_argument('--format', choices=['text', 'binary'], default='text')
+    args = parser.parse_args()
+
+    external_sort(args.input, args.output, args.memory_limit, args.fan_in, args.algorithm, args.format)
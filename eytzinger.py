@@ -0,0 +1,117 @@
+import random
+import sys
+import time
+from array import array
+from bisect import bisect_left
+
+from ex6_avg import binary_search
+from vectorized import np
+
+# Sorted int64 values stored in Eytzinger (BFS) order: node k has children 2k and 2k+1,
+# so the first levels of every search share the same few cache lines. layout is
+# 1-indexed (slot 0 unused) and rank[k] is the sorted position of layout[k]
+class EytzingerIndex:
+    def __init__(self, sorted_arr):
+        n = len(sorted_arr)
+        self.size = n
+        self.layout = array('q', bytes(8 * (n + 1)))
+        self.rank = array('q', bytes(8 * (n + 1)))
+
+        # In-order walk of the implicit tree hands out the sorted values in order
+        stack = []
+        k = 1
+        pos = 0
+        while stack or k <= n:
+            while k <= n:
+                stack.append(k)
+                k *= 2
+            k = stack.pop()
+            self.layout[k] = sorted_arr[pos]
+            self.rank[k] = pos
+            pos += 1
+            k = 2 * k + 1
+
+        self.np_layout = None
+        self.np_rank = None
+        if np is not None:
+            self.np_layout = np.frombuffer(self.layout, dtype=np.int64)
+            self.np_rank = np.frombuffer(self.rank, dtype=np.int64)
+
+    # First sorted position of key, or -1. The loop body has no data-dependent branch:
+    # the comparison result is added straight into the next node index
+    def search(self, key):
+        layout = self.layout
+        n = self.size
+        k = 1
+        while k <= n:
+            k = 2 * k + (layout[k] < key)
+
+        # Undo the trailing right turns to land on the lower-bound node
+        k >>= ((~k) & (k + 1)).bit_length()
+        if k and layout[k] == key:
+            return self.rank[k]
+        return -1
+
+    # Vectorized lookup of a whole batch of keys (requires numpy); -1 marks absent keys
+    def batch_search(self, keys):
+        keys = np.asarray(keys, dtype=np.int64)
+        layout = self.np_layout
+        n = self.size
+        k = np.ones(keys.shape, dtype=np.int64)
+
+        for _ in range(n.bit_length()):
+            inside = k <= n
+            k = np.where(inside, 2 * k + (layout[np.where(inside, k, 0)] < keys), k)
+
+        lowest_zero = (k + 1) & ~k
+        k >>= np.log2(lowest_zero).astype(np.int64) + 1
+        found = (k > 0) & (layout[k] == keys)
+        return np.where(found, self.np_rank[k], -1)
+
+# Time num_queries lookups against a plain sorted list and against the Eytzinger index
+def benchmark(sizes, num_queries=100000):
+    for size in sizes:
+        print(f"Testing with size: {size}")
+        data = array('q', range(0, 2 * size, 2))
+        queries = [random.randrange(2 * size) for _ in range(num_queries)]
+
+        start_time = time.perf_counter()
+        index = EytzingerIndex(data)
+        build_time = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        for key in queries:
+            binary_search(data, key)
+        binary_time = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        for key in queries:
+            bisect_left(data, key)
+        bisect_time = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        for key in queries:
+            index.search(key)
+        eytzinger_time = time.perf_counter() - start_time
+
+        print(f"  build: {build_time:.3f}s  binary_search: {binary_time:.3f}s  "
+              f"bisect: {bisect_time:.3f}s  eytzinger: {eytzinger_time:.3f}s")
+
+        if np is not None:
+            np_data = np.frombuffer(data, dtype=np.int64)
+            np_queries = np.array(queries, dtype=np.int64)
+
+            start_time = time.perf_counter()
+            np.searchsorted(np_data, np_queries)
+            searchsorted_time = time.perf_counter() - start_time
+
+            start_time = time.perf_counter()
+            index.batch_search(np_queries)
+            batch_time = time.perf_counter() - start_time
+
+            print(f"  searchsorted batch: {searchsorted_time:.3f}s  eytzinger batch: {batch_time:.3f}s")
+
+# Usage: python eytzinger.py [size ...]   (defaults to 10^6 and 10^7)
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10**6, 10**7]
+    benchmark(sizes)
@@ -0,0 +1,68 @@
+import sys
+
+from sort_cache import fingerprint
+
+# value -> first index lookup for an unsorted array. Built once in O(n), then every
+# lookup is O(1). A stale index is rebuilt on the next lookup. Callers must change the
+# array through update()/append() (or call invalidate() after writing to it directly):
+# those are the only changes that are always caught. As a safety net every lookup also
+# compares the array's sort_cache.fingerprint (its length and a fixed sample of its
+# elements) with the one taken at build time, but a direct write to an element outside
+# that sample goes unnoticed and lookups would return stale positions
+class HashIndex:
+    def __init__(self, arr):
+        self.arr = arr
+        self.index = None
+        self.indexed_fingerprint = None
+        self.builds = 0
+        self.rebuild()
+
+    def rebuild(self):
+        index = {}
+        for i in range(len(self.arr)):
+            value = self.arr[i]
+            if value not in index:
+                index[value] = i
+        self.index = index
+        self.indexed_fingerprint = fingerprint(self.arr)
+        self.builds += 1
+
+    def invalidate(self):
+        self.index = None
+
+    def is_stale(self):
+        return self.index is None or self.indexed_fingerprint != fingerprint(self.arr)
+
+    # First index of target in the array, or -1 (same contract as linear_search)
+    def lookup(self, target):
+        if self.is_stale():
+            self.rebuild()
+        return self.index.get(target, -1)
+
+    def __contains__(self, target):
+        return self.lookup(target) != -1
+
+    def update(self, i, value):
+        self.arr[i] = value
+        self.invalidate()
+
+    # Appending cannot move any existing first index, so the index is patched in place
+    def append(self, value):
+        stale = self.is_stale()
+        self.arr.append(value)
+        if stale:
+            self.invalidate()
+            return
+        self.index.setdefault(value, len(self.arr) - 1)
+        self.indexed_fingerprint = fingerprint(self.arr)
+
+    # Bytes held by the index on top of the array itself: the dict's table plus any
+    # position ints outside CPython's small-int cache (keys are shared with the array)
+    def memory_bytes(self):
+        if self.index is None:
+            return 0
+        total = sys.getsizeof(self.index)
+        for position in self.index.values():
+            if position > 256:
+                total += sys.getsizeof(position)
+        return total
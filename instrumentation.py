@@ -0,0 +1,194 @@
+import sys
+import tracemalloc
+
+from vectorized import is_ndarray
+
+# Operation counts for one instrumented call, plus the call's own return value
+class OperationCounts:
+    def __init__(self):
+        self.result = None
+        self.comparisons = 0
+        self.moves = 0
+        self.swaps = 0
+        self.max_depth = 0
+        self.peak_bytes = 0
+
+    def as_dict(self):
+        return {'comparisons': self.comparisons, 'moves': self.moves, 'swaps': self.swaps,
+                'max_depth': self.max_depth, 'peak_bytes': self.peak_bytes}
+
+    def __str__(self):
+        return (f"{self.comparisons} comparisons, {self.moves} moves ({self.swaps} swaps), "
+                f"max recursion depth {self.max_depth}, peak allocation {self.peak_bytes} bytes")
+
+# Mixed into a per-run subclass of each element type (int, float, str, ...) so elements keep
+# working with arithmetic and isinstance checks while every comparison bumps counts
+class CountedMixin:
+    counts = None
+
+    def __lt__(self, other):
+        self.counts.comparisons += 1
+        return super().__lt__(other)
+
+    def __le__(self, other):
+        self.counts.comparisons += 1
+        return super().__le__(other)
+
+    def __gt__(self, other):
+        self.counts.comparisons += 1
+        return super().__gt__(other)
+
+    def __ge__(self, other):
+        self.counts.comparisons += 1
+        return super().__ge__(other)
+
+    def __eq__(self, other):
+        self.counts.comparisons += 1
+        return super().__eq__(other)
+
+    def __ne__(self, other):
+        self.counts.comparisons += 1
+        return super().__ne__(other)
+
+# None for types that cannot be subclassed (bool, NoneType, ...); their elements are left
+# unwrapped and only comparisons made through a counted element are counted
+def counted_type(base, counts):
+    try:
+        return type(f'Counted{base.__name__}', (CountedMixin, base), {'counts': counts, '__hash__': base.__hash__})
+    except TypeError:
+        return None
+
+# List that counts element writes. Two writes that exchange the same two element objects
+# back to back (arr[i], arr[j] = arr[j], arr[i], or the same through a temporary) also
+# count as one swap. typed_arrays.copy_range and scratch_like hand back CountingLists
+# sharing the same counts, so writes into scratch buffers are counted too
+class CountingList(list):
+    def __init__(self, values, counts):
+        super().__init__(values)
+        self.counts = counts
+        self.last_write = None
+
+    # Copying elements out into a buffer moves each of them once
+    def copy_range(self, low, high):
+        copy = CountingList(super().__getitem__(slice(low, high)), self.counts)
+        self.counts.moves += len(copy)
+        return copy
+
+    def scratch_like(self, size):
+        return CountingList([None] * size, self.counts)
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            value = list(value)
+            self.counts.moves += len(value)
+            self.last_write = None
+            super().__setitem__(index, value)
+            return
+
+        old = super().__getitem__(index)
+        super().__setitem__(index, value)
+        self.counts.moves += 1
+
+        last = self.last_write
+        if last is not None and value is last[1] and old is last[2]:
+            self.counts.swaps += 1
+            self.last_write = None
+        else:
+            self.last_write = (index, old, value)
+
+# Run func(arr, *args) on an instrumented copy of arr and return its OperationCounts.
+# Elements are wrapped to count comparisons and the copy counts writes; max_depth is the
+# deepest simultaneous recursion of any one Python function (via sys.setprofile) and
+# peak_bytes the peak traced allocation during the call. Whatever order func leaves the
+# copy in is written back into arr, so sorts still sort arr (list, array('q'), memoryview
+# or numpy). Nothing here touches the algorithms, so uninstrumented calls cost nothing
+def instrument(func, arr, *args, depth=True, memory=True, **kwargs):
+    if is_ndarray(arr) and arr.ndim != 1:
+        raise ValueError("Only one-dimensional arrays can be instrumented")
+
+    counts = OperationCounts()
+    types = {}
+    wrapped = []
+    for value in arr:
+        base = type(value)
+        if base not in types:
+            # Packed arrays and numpy hand back int-compatible scalars
+            types[base] = counted_type(int if is_ndarray(arr) else base, counts)
+        wrapped.append(value if types[base] is None else types[base](value))
+    counted = CountingList(wrapped, counts)
+
+    active = {}
+
+    def profile(frame, event, _):
+        if event == 'call':
+            code = frame.f_code
+            active[code] = active.get(code, 0) + 1
+            if active[code] > counts.max_depth:
+                counts.max_depth = active[code]
+        elif event == 'return':
+            code = frame.f_code
+            if active.get(code):
+                active[code] -= 1
+
+    previous_profile = sys.getprofile()
+    was_tracing = tracemalloc.is_tracing()
+    if memory:
+        if not was_tracing:
+            tracemalloc.start()
+        baseline = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+    if depth:
+        sys.setprofile(profile)
+    try:
+        result = func(counted, *args, **kwargs)
+    finally:
+        if depth:
+            sys.setprofile(previous_profile)
+        if memory:
+            counts.peak_bytes = tracemalloc.get_traced_memory()[1] - baseline
+            if not was_tracing:
+                tracemalloc.stop()
+
+    # The list itself is an argument, not what the caller asked about
+    counts.result = arr if result is counted else result
+
+    plain = [unwrap(value) for value in counted]
+    if isinstance(arr, list):
+        arr[:] = plain
+    else:
+        for i, value in enumerate(plain):
+            arr[i] = value
+    return counts
+
+def unwrap(value):
+    base = type(value)
+    if issubclass(base, CountedMixin):
+        # MRO is (Counted<base>, CountedMixin, base, ...)
+        return base.__mro__[2](value)
+    return value
+
+# Usage: python instrumentation.py [size]
+if __name__ == "__main__":
+    import random
+    from bisect import bisect_left
+
+    from searching import batch_binary_search, interpolation_search
+    from sweep import ALGORITHMS
+
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    values = random.sample(range(size * 10), size)
+
+    for name, sort in ALGORITHMS.items():
+        # Untraced first call, so lazy imports do not show up in the counts
+        sort(values[:2])
+        print(f"{name:16} {instrument(sort, list(values))}")
+
+    sorted_values = sorted(values)
+    keys = random.sample(sorted_values, min(100, size))
+    searches = {
+        'bisect': lambda arr: [bisect_left(arr, key) for key in keys],
+        'batch_binary': lambda arr: batch_binary_search(arr, sorted(keys)),
+        'interpolation': lambda arr: [interpolation_search(arr, key) for key in keys],
+    }
+    for name, search in searches.items():
+        print(f"{name:16} {instrument(search, sorted_values, depth=False)}")
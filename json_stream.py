@@ -0,0 +1,55 @@
+from array import array
+
+from vectorized import np
+
+# Characters read per block
+READ_BLOCK = 1 << 16
+
+# Integers per yielded chunk
+CHUNK_SIZE = 4096
+
+# Yield lists of up to chunk_size integers from a JSON array file such as ex7tasks.json,
+# reading it in fixed-size blocks so the whole file is never held in memory. Brackets,
+# commas and whitespace all separate values, so plain one-per-line files work too
+def iter_json_chunks(path, chunk_size=CHUNK_SIZE, block_size=READ_BLOCK):
+    with open(path, 'r', encoding='UTF-8') as file:
+        pending = ''
+        chunk = []
+        while True:
+            text = file.read(block_size)
+            if not text:
+                break
+            text = pending + text.replace('[', ' ').replace(']', ' ').replace(',', ' ')
+            tokens = text.split()
+
+            # The last token may continue in the next block
+            if tokens and not text[-1].isspace():
+                pending = tokens.pop()
+            else:
+                pending = ''
+
+            for token in tokens:
+                chunk.append(int(token))
+                if len(chunk) == chunk_size:
+                    yield chunk
+                    chunk = []
+        if pending:
+            chunk.append(int(pending))
+        if chunk:
+            yield chunk
+
+# Yield the integers one at a time, so lookups can start before the file is fully read
+def iter_json_integers(path, block_size=READ_BLOCK):
+    for chunk in iter_json_chunks(path, block_size=block_size):
+        yield from chunk
+
+# Load straight into a packed int64 array (8 bytes per value instead of a boxed int)
+def load_array(path):
+    values = array('q')
+    for chunk in iter_json_chunks(path):
+        values.extend(chunk)
+    return values
+
+# Same, as a numpy int64 array sharing the packed buffer (requires numpy)
+def load_numpy(path):
+    return np.frombuffer(load_array(path), dtype=np.int64)
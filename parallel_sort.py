@@ -0,0 +1,93 @@
+import heapq
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+from ex1 import merge_sort
+from sorting import introsort
+from vectorized import is_ndarray, np_sort
+
+# Below this many elements the pool start-up costs more than it saves
+PARALLEL_THRESHOLD = 50000
+
+# Per-chunk sorts the workers can run
+ALGORITHMS = ('merge', 'quick')
+
+# Sort arr (ints that fit in int64) across a process pool. The input is copied once into
+# a shared-memory int64 buffer, each worker sorts its own chunk of that buffer in place,
+# and the sorted chunks are combined with a k-way merge. Only the buffer name and the
+# chunk bounds are sent to the workers, never the list itself.
+def parallel_sort(arr, workers=None, algorithm='merge'):
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"Unknown algorithm: {algorithm}")
+    if is_ndarray(arr):
+        np_sort(arr)
+        return arr
+    if isinstance(arr, memoryview) and arr.format != 'q':
+        raise TypeError(f"Only int64 ('q') memoryviews can be sorted, not '{arr.format}'")
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    size = len(arr)
+    if workers < 2 or size < PARALLEL_THRESHOLD:
+        sort_chunk_in_place(arr, algorithm)
+        return arr
+
+    itemsize = array('q').itemsize
+    shm = shared_memory.SharedMemory(create=True, size=size * itemsize)
+    view = None
+    chunks = []
+    try:
+        view = shm.buf.cast('q')
+        view[:] = array('q', arr)
+
+        # Split into one chunk per worker
+        step = -(-size // workers)
+        bounds = [(start, min(start + step, size)) for start in range(0, size, step)]
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            jobs = [pool.submit(sort_shared_chunk, shm.name, start, end, algorithm)
+                    for start, end in bounds]
+            for job in jobs:
+                job.result()
+
+        # k-way merge of the sorted chunks straight back into arr
+        chunks = [view[start:end] for start, end in bounds]
+        if isinstance(arr, array):
+            arr[:] = array(arr.typecode, heapq.merge(*chunks))
+        elif isinstance(arr, memoryview):
+            arr[:] = array('q', heapq.merge(*chunks))
+        else:
+            arr[:] = heapq.merge(*chunks)
+    finally:
+        # The segment cannot be closed while views into it are alive
+        for chunk in chunks:
+            chunk.release()
+        if view is not None:
+            view.release()
+        shm.close()
+        shm.unlink()
+
+    return arr
+
+# Worker: attach to the shared buffer by name and sort view[start:end] in place
+def sort_shared_chunk(name, start, end, algorithm):
+    shm = shared_memory.SharedMemory(name=name)
+    view = shm.buf.cast('q')
+    try:
+        chunk = view[start:end].tolist()
+        sort_chunk_in_place(chunk, algorithm)
+        view[start:end] = array('q', chunk)
+    finally:
+        view.release()
+        shm.close()
+
+def sort_chunk_in_place(arr, algorithm):
+    if algorithm == 'merge':
+        merge_sort(arr, 0, len(arr) - 1)
+    elif algorithm == 'quick':
+        introsort(arr)
+    else:
+        raise ValueError(f"Unknown algorithm: {algorithm}")
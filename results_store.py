@@ -0,0 +1,252 @@
+import argparse
+import hashlib
+import json
+import math
+import os
+import platform
+import sqlite3
+import subprocess
+import sys
+import time
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY,
+    commit_hash TEXT NOT NULL,
+    machine TEXT NOT NULL,
+    algorithm TEXT NOT NULL,
+    generator TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    representation TEXT NOT NULL,
+    seed INTEGER NOT NULL,
+    median_ns REAL NOT NULL,
+    q1_ns REAL NOT NULL,
+    q3_ns REAL NOT NULL,
+    samples_ns TEXT NOT NULL,
+    recorded_at REAL NOT NULL,
+    UNIQUE (commit_hash, machine, algorithm, generator, size, representation, seed)
+);
+"""
+
+# A slowdown is reported when the candidate's samples are larger with a one-sided
+# Mann-Whitney p-value below SIGNIFICANCE and its median is at least MIN_SLOWDOWN slower
+SIGNIFICANCE = 0.01
+MIN_SLOWDOWN = 0.05
+
+# Verdicts of a compared cell. A cell is INSUFFICIENT when its sample counts could not
+# reach SIGNIFICANCE even with every candidate sample slower than every baseline one
+# (at 0.01 that needs 5 vs 5; measure stops slow cells after 3 samples, so run more
+# seeds for those)
+REGRESSION = 'regression'
+INSUFFICIENT = 'insufficient samples'
+CLEAN = ''
+
+# Records of a JSON-lines results file such as sweep.py writes (lines cut short by a
+# crash are skipped)
+def load_results(path):
+    if not os.path.exists(path):
+        return []
+    records = []
+    with open(path, 'r', encoding='UTF-8') as file:
+        for line in file:
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    return records
+
+# Short hash of what the timings depend on: CPU, OS and Python build
+def machine_fingerprint():
+    parts = (platform.machine(), platform.processor(), platform.system(), platform.release(),
+             platform.python_implementation(), platform.python_version(), str(os.cpu_count()))
+    return hashlib.sha1('|'.join(parts).encode()).hexdigest()[:12]
+
+# Commit the working tree is at, with '-dirty' appended when it has uncommitted changes
+def git_commit(cwd=None):
+    cwd = cwd or os.path.dirname(os.path.abspath(__file__))
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=cwd, capture_output=True,
+                                text=True, check=True).stdout.strip()
+        status = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=cwd,
+                                capture_output=True, text=True, check=True).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+    return commit + '-dirty' if status.strip() else commit
+
+# SQLite store of benchmark measurements, one row per measured cell. Rows keep the raw
+# samples so two commits can be compared with a significance test, not just by median.
+# A cell already stored for a commit and machine is kept as is, so importing the same
+# results again never duplicates samples
+class ResultStore:
+    def __init__(self, path='benchmark_results.db'):
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript(SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # Store one benchmark.Measurement; returns whether it was added
+    def record(self, algorithm, generator, size, measurement, representation='list', seed=0,
+               commit=None, machine=None):
+        added = self.insert(commit or git_commit(), machine or machine_fingerprint(), algorithm,
+                            generator, size, representation, seed, measurement.median, measurement.q1,
+                            measurement.q3, measurement.samples_ns)
+        self.connection.commit()
+        return added
+
+    # Store the records of a sweep.py results file; returns how many were new
+    def import_sweep(self, path, commit=None, machine=None):
+        commit = commit or git_commit()
+        machine = machine or machine_fingerprint()
+        added = 0
+        for r in load_results(path):
+            added += self.insert(commit, machine, r['algorithm'], r['generator'], r['size'],
+                                 r['representation'], r['seed'], r['median_ns'], r['q1_ns'], r['q3_ns'],
+                                 r.get('samples_ns', [r['median_ns']]))
+        self.connection.commit()
+        return added
+
+    def insert(self, commit, machine, algorithm, generator, size, representation, seed, median_ns,
+               q1_ns, q3_ns, samples_ns):
+        cursor = self.connection.execute(
+            "INSERT OR IGNORE INTO results (commit_hash, machine, algorithm, generator, size,"
+            " representation, seed, median_ns, q1_ns, q3_ns, samples_ns, recorded_at)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (commit, machine, algorithm, generator, size, representation, seed, median_ns, q1_ns,
+             q3_ns, json.dumps(samples_ns), time.time()))
+        return cursor.rowcount == 1
+
+    # All samples per (algorithm, generator, size, representation) for one commit and machine
+    def samples(self, commit, machine):
+        cells = {}
+        rows = self.connection.execute(
+            "SELECT algorithm, generator, size, representation, samples_ns FROM results"
+            " WHERE commit_hash = ? AND machine = ?", (commit, machine))
+        for algorithm, generator, size, representation, samples in rows:
+            cells.setdefault((algorithm, generator, size, representation), []).extend(json.loads(samples))
+        return cells
+
+    def commits(self, machine):
+        rows = self.connection.execute(
+            "SELECT commit_hash, MAX(recorded_at) FROM results WHERE machine = ?"
+            " GROUP BY commit_hash ORDER BY MAX(recorded_at)", (machine,))
+        return [commit for commit, _ in rows]
+
+    # Compare the cells both commits measured on this machine. Returns (key, baseline
+    # median, candidate median, p-value, verdict) tuples, slowest ratio first
+    def compare(self, baseline, candidate, machine=None, significance=SIGNIFICANCE,
+                min_slowdown=MIN_SLOWDOWN):
+        machine = machine or machine_fingerprint()
+        before = self.samples(baseline, machine)
+        after = self.samples(candidate, machine)
+
+        rows = []
+        for key in sorted(before.keys() & after.keys()):
+            old_median = median(before[key])
+            new_median = median(after[key])
+            p_value = mann_whitney_greater(after[key], before[key])
+            if smallest_p_value(len(after[key]), len(before[key])) >= significance:
+                verdict = INSUFFICIENT
+            elif p_value < significance and new_median > old_median * (1 + min_slowdown):
+                verdict = REGRESSION
+            else:
+                verdict = CLEAN
+            rows.append((key, old_median, new_median, p_value, verdict))
+        rows.sort(key=lambda row: row[2] / row[1] if row[1] else 0, reverse=True)
+        return rows
+
+def median(values):
+    ordered = sorted(values)
+    mid = len(ordered) // 2
+    return ordered[mid] if len(ordered) % 2 else (ordered[mid - 1] + ordered[mid]) / 2
+
+# One-sided Mann-Whitney U test that samples a tend to be larger than samples b, using the
+# normal approximation with a tie correction. Returns the p-value (1.0 when undecidable)
+def mann_whitney_greater(a, b):
+    n1, n2 = len(a), len(b)
+    if n1 == 0 or n2 == 0:
+        return 1.0
+
+    # Average ranks over the pooled samples, with tied values sharing their mean rank
+    pooled = sorted([(value, 0) for value in a] + [(value, 1) for value in b])
+    rank_sum = 0.0
+    tie_term = 0
+    i = 0
+    while i < len(pooled):
+        j = i
+        while j + 1 < len(pooled) and pooled[j + 1][0] == pooled[i][0]:
+            j += 1
+        rank = (i + j) / 2 + 1
+        rank_sum += rank * sum(1 for k in range(i, j + 1) if pooled[k][1] == 0)
+        ties = j - i + 1
+        tie_term += ties ** 3 - ties
+        i = j + 1
+
+    u = rank_sum - n1 * (n1 + 1) / 2
+    n = n1 + n2
+    variance = n1 * n2 / 12 * ((n + 1) - tie_term / (n * (n - 1))) if n > 1 else 0
+    if variance <= 0:
+        return 1.0
+    z = (u - n1 * n2 / 2 - 0.5) / math.sqrt(variance)
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+# Lowest p-value mann_whitney_greater can return for n1 vs n2 samples (complete separation)
+def smallest_p_value(n1, n2):
+    return mann_whitney_greater(range(n2, n2 + n1), range(n2))
+
+def print_comparison(rows):
+    for (algorithm, generator, size, representation), old, new, p_value, verdict in rows:
+        print(f"{algorithm:16} {generator:10} {size:>8} {representation:10} "
+              f"{old / 1e6:10.3f} ms -> {new / 1e6:10.3f} ms  x{new / old if old else 0:5.2f}  "
+              f"p={p_value:.4f} {verdict.upper()}")
+
+# Usage: python results_store.py import sweep_results.jsonl
+#        python results_store.py compare BASELINE_COMMIT [CANDIDATE_COMMIT]
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Store benchmark results and check for regressions")
+    parser.add_argument('--db', default='benchmark_results.db')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    importer = commands.add_parser('import', help="add a sweep.py results file for the current commit")
+    importer.add_argument('path')
+    importer.add_argument('--commit', default=None, help="defaults to the checked-out commit")
+
+    comparer = commands.add_parser('compare', help="flag significant slowdowns against a baseline")
+    comparer.add_argument('baseline')
+    comparer.add_argument('candidate', nargs='?', default=None,
+                          help="defaults to the latest stored commit other than the baseline")
+    comparer.add_argument('--machine', default=None, help="defaults to this machine's fingerprint")
+
+    commands.add_parser('commits', help="list stored commits for this machine")
+    args = parser.parse_args()
+
+    with ResultStore(args.db) as store:
+        if args.command == 'import':
+            count = store.import_sweep(args.path, args.commit)
+            print(f"Stored {count} new results")
+        elif args.command == 'commits':
+            for commit in store.commits(machine_fingerprint()):
+                print(commit)
+        else:
+            machine = args.machine or machine_fingerprint()
+            candidate = args.candidate
+            if candidate is None:
+                others = [commit for commit in store.commits(machine) if commit != args.baseline]
+                if not others:
+                    print(f"No stored results for a commit other than {args.baseline} on machine {machine}")
+                    sys.exit(2)
+                candidate = others[-1]
+            print(f"Comparing {candidate} against {args.baseline}")
+            rows = store.compare(args.baseline, candidate, machine)
+            print_comparison(rows)
+            regressions = sum(1 for row in rows if row[4] == REGRESSION)
+            insufficient = sum(1 for row in rows if row[4] == INSUFFICIENT)
+            print(f"{len(rows)} cells compared, {regressions} significant slowdowns, "
+                  f"{insufficient} with too few samples to test")
+            sys.exit(1 if regressions else 0)
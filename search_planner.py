@@ -0,0 +1,135 @@
+import math
+import random
+from bisect import bisect_left
+
+from benchmark import measure
+from hash_index import HashIndex
+from sort_cache import fingerprint
+from sorting import introsort
+
+LINEAR = 'linear'
+SORTED = 'sorted'
+HASH = 'hash'
+
+# Per-element cost constants (seconds), measured once per process and shared by every
+# planner, so two planners in one run never disagree because of timing noise
+_constants = None
+
+# Time each building block on a calibration array so plan costs are in real seconds.
+# Each constant is the median of benchmark.measure samples, so one noisy run cannot flip
+# a plan
+def measure_constants(size=2000):
+    arr = random.sample(range(size * 10), size)
+    log_n = math.log2(size)
+    missing = -1
+
+    scan = measure(linear_scan, arr, missing).seconds / size
+    sort = measure(build_sorted, arr).seconds / (size * log_n)
+
+    values, _ = build_sorted(arr)
+    probe = measure(probe_all, values, arr).seconds / (size * log_n)
+
+    hash_build = measure(HashIndex, arr).seconds / size
+    hash_lookup = measure(lookup_all, HashIndex(arr), arr).seconds / size
+
+    return {'scan': scan, 'sort': sort, 'probe': probe,
+            'hash_build': hash_build, 'hash_lookup': hash_lookup}
+
+def probe_all(values, targets):
+    for target in targets:
+        bisect_left(values, target)
+
+def lookup_all(index, targets):
+    for target in targets:
+        index.lookup(target)
+
+def get_constants():
+    global _constants
+    if _constants is None:
+        _constants = measure_constants()
+    return _constants
+
+# Estimated total seconds for each plan to answer num_queries lookups on size elements
+def estimate_costs(size, num_queries, constants):
+    log_n = math.log2(size) if size > 1 else 1
+    return {
+        LINEAR: num_queries * constants['scan'] * size,
+        SORTED: constants['sort'] * size * log_n + num_queries * constants['probe'] * log_n,
+        HASH: constants['hash_build'] * size + num_queries * constants['hash_lookup'],
+    }
+
+def choose_plan(size, num_queries, constants):
+    costs = estimate_costs(size, num_queries, constants)
+    return min(costs, key=costs.get)
+
+# Answers "first index of target in arr, or -1" for a stream of queries on one array.
+# The plan is picked from the expected query count; the sorted copy or hash index is
+# built on first use and kept, so repeated queries never re-sort. If more queries
+# arrive than expected, the expectation doubles and the plan is re-evaluated.
+# Both structures are dropped and rebuilt when the array's sort_cache.fingerprint (its
+# length and a sample of its elements) changes. That sample cannot see every in-place
+# write, so after changing arr call invalidate() rather than relying on it
+class SearchPlanner:
+    def __init__(self, arr, expected_queries=1, constants=None):
+        self.arr = arr
+        self.expected_queries = max(expected_queries, 1)
+        self.constants = constants or get_constants()
+        self.queries = 0
+        self.sorted_values = None
+        self.sorted_positions = None
+        self.hash_index = None
+        self.built_fingerprint = None
+        self.plan = choose_plan(len(arr), self.expected_queries, self.constants)
+
+    def invalidate(self):
+        self.sorted_values = None
+        self.sorted_positions = None
+        self.hash_index = None
+        self.built_fingerprint = None
+
+    def search(self, target):
+        self.queries += 1
+        if self.built_fingerprint is not None and fingerprint(self.arr) != self.built_fingerprint:
+            self.invalidate()
+        if self.queries > self.expected_queries:
+            self.expected_queries *= 2
+            self.plan = choose_plan(len(self.arr), self.expected_queries, self.constants)
+
+        if self.plan == LINEAR:
+            return linear_scan(self.arr, target)
+
+        if self.plan == SORTED:
+            if self.sorted_values is None:
+                self.sorted_values, self.sorted_positions = build_sorted(self.arr)
+                self.built_fingerprint = fingerprint(self.arr)
+            pos = bisect_left(self.sorted_values, target)
+            if pos < len(self.sorted_values) and self.sorted_values[pos] == target:
+                return self.sorted_positions[pos]
+            return -1
+
+        if self.hash_index is None:
+            self.hash_index = HashIndex(self.arr)
+            self.built_fingerprint = fingerprint(self.arr)
+        return self.hash_index.lookup(target)
+
+def linear_scan(arr, target):
+    for i in range(len(arr)):
+        if arr[i] == target:
+            return i
+    return -1
+
+# Sort (value, position) pairs once so a bisect also recovers the first original position
+def build_sorted(arr):
+    pairs = [(value, i) for i, value in enumerate(arr)]
+    introsort(pairs)
+    return [value for value, _ in pairs], [i for _, i in pairs]
+
+# Show which plan wins for a few array sizes and query counts
+if __name__ == "__main__":
+    constants = get_constants()
+    for size in [100, 1000, 10000, 100000]:
+        for num_queries in [1, 10, 100, 1000]:
+            costs = estimate_costs(size, num_queries, constants)
+            plan = min(costs, key=costs.get)
+            print(f"size={size:>6} queries={num_queries:>4}: {plan:<6} "
+                  + "  ".join(f"{name}={cost * 1000:.3f}ms" for name, cost in costs.items()))
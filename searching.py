@@ -0,0 +1,62 @@
+from bisect import bisect_left
+
+# Look up every key of keys in the sorted arr at once. The keys are visited in sorted
+# order and each search gallops forward from where the previous one ended, so k lookups
+# cost O(k log(n/k)) instead of k*log(n). Returns the first position of each key in the
+# original key order, or -1 if the key is absent
+def batch_binary_search(arr, keys):
+    positions = [-1] * len(keys)
+    order = sorted(range(len(keys)), key=keys.__getitem__)
+    n = len(arr)
+    low = 0
+    step = 1
+
+    for index in order:
+        key = keys[index]
+
+        # Gallop forward until arr[high] >= key, keeping arr[low - 1] < key. The first
+        # probe reuses the previous gap, so evenly spread keys rarely need a second one
+        start = low
+        high = low + step
+        while high < n and arr[high] < key:
+            low = high + 1
+            step *= 2
+            high = low + step
+
+        pos = bisect_left(arr, key, low, min(high, n))
+        if pos < n and arr[pos] == key:
+            positions[index] = pos
+        step = max(pos - start, 1)
+        low = pos
+
+    return positions
+
+# Interpolation-binary hybrid search. Each step interpolates the probe position, but
+# when an interpolation step fails to at least halve the window the next step bisects
+# instead, so uniform keys take O(log log n) probes and skewed keys never more than
+# about 2*log2(n). Returns (position or -1, number of probes)
+def interpolation_search(arr, key):
+    low = 0
+    high = len(arr) - 1
+    probes = 0
+    bisect_next = False
+
+    while low <= high and not key < arr[low] and not arr[high] < key:
+        size = high - low
+        if bisect_next or arr[high] == arr[low]:
+            mid = (low + high) // 2
+        else:
+            mid = low + int((key - arr[low]) * (high - low) // (arr[high] - arr[low]))
+
+        probes += 1
+        if arr[mid] < key:
+            low = mid + 1
+        elif key < arr[mid]:
+            high = mid - 1
+        else:
+            return mid, probes
+
+        # Guard: fall back to one bisection step if the window did not halve
+        bisect_next = not bisect_next and high - low > size // 2
+
+    return -1, probes
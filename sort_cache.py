@@ -0,0 +1,97 @@
+from array import array
+from collections import OrderedDict
+
+from sorting import introsort
+from typed_arrays import copy_array
+from vectorized import is_ndarray, np
+
+# How many evenly spaced elements go into an array's fingerprint
+FINGERPRINT_SAMPLES = 32
+
+# Cheap content fingerprint: the representation, the length plus a hash of a fixed number
+# of sampled elements. Equal contents in different representations (a memoryview and an
+# array('q') compare equal) get different keys, so a hit returns the caller's own type
+def fingerprint(arr):
+    kind = representation_key(arr)
+    n = len(arr)
+    if n == 0:
+        return (kind, 0, 0)
+    step = max(1, n // FINGERPRINT_SAMPLES)
+    if is_ndarray(arr):
+        sample = arr[::step].tobytes()
+    else:
+        sample = tuple(arr[::step])
+    return (kind, n, hash((sample, arr[n - 1])))
+
+# Container type plus its element format (typecode, buffer format or dtype) where it has one
+def representation_key(arr):
+    if isinstance(arr, memoryview):
+        return ('memoryview', arr.format)
+    if isinstance(arr, array):
+        return ('array', arr.typecode)
+    if is_ndarray(arr):
+        return ('ndarray', arr.dtype.str)
+    return (type(arr).__name__,)
+
+def same_contents(a, b):
+    if is_ndarray(a) or is_ndarray(b):
+        return np.array_equal(a, b)
+    return a == b
+
+# LRU cache of sorted results keyed by (sort, fingerprint), so each sort function gets
+# its own entries. A hit is verified against a stored
+# copy of the original input (O(n)) before the cached sorted result is handed back, so a
+# fingerprint collision can only cost a miss. Entries are evicted least recently used
+# first once the stored element count (input copy plus sorted result) exceeds max_elements
+class SortCache:
+    def __init__(self, max_elements=1000000):
+        self.max_elements = max_elements
+        self.entries = OrderedDict()
+        self.total_elements = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    # Sorted version of arr, computed on a miss by sorting a copy in place with sort(copy)
+    # (its return value is ignored, so sorts returning None work). The returned object is
+    # shared with the cache and must be treated as read-only
+    def sorted_copy(self, arr, sort=introsort):
+        key = (sort, fingerprint(arr))
+        entry = self.entries.get(key)
+        if entry is not None and same_contents(entry[0], arr):
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+        self.misses += 1
+        original = copy_array(arr)
+        result = copy_array(arr)
+        sort(result)
+        self.store(key, original, result)
+        return result
+
+    def store(self, key, original, result):
+        if key in self.entries:
+            self.discard(key)
+
+        size = 2 * len(original)
+        if size > self.max_elements:
+            return
+
+        self.entries[key] = (original, result)
+        self.total_elements += size
+        while self.total_elements > self.max_elements:
+            self.discard(next(iter(self.entries)))
+            self.evictions += 1
+
+    def discard(self, key):
+        original, _ = self.entries.pop(key)
+        self.total_elements -= 2 * len(original)
+
+    def clear(self):
+        self.entries.clear()
+        self.total_elements = 0
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+                'entries': len(self.entries), 'elements': self.total_elements}
@@ -0,0 +1,60 @@
+import mmap
+import struct
+import sys
+from array import array
+
+from json_stream import load_array
+from sorting import introsort
+
+# File layout: 16-byte header (magic, format version, element count) followed by the
+# sorted values as native-endian int64. The header size keeps the values 8-byte aligned
+MAGIC = b'SIDX'
+VERSION = 1
+HEADER = struct.Struct('<4sIQ')
+
+# Convert a JSON array of integers into a sorted index file (done once per dataset)
+def build_index(json_path, index_path):
+    values = load_array(json_path)
+    introsort(values)
+    write_index(values, index_path)
+    return len(values)
+
+def write_index(values, index_path):
+    with open(index_path, 'wb') as file:
+        file.write(HEADER.pack(MAGIC, VERSION, len(values)))
+        array('q', values).tofile(file)
+
+# Read-only view of an index file. data is a memoryview of int64 backed by the mmap,
+# so a binary search only pages in what it touches and startup does not parse anything
+class SortedIndex:
+    def __init__(self, index_path):
+        self.file = open(index_path, 'rb')
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, count = HEADER.unpack_from(self.map, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"{index_path} is not a sorted index file")
+
+        self.data = memoryview(self.map)[HEADER.size:HEADER.size + count * 8].cast('q')
+
+    def __len__(self):
+        return len(self.data)
+
+    def close(self):
+        if getattr(self, 'data', None) is not None:
+            self.data.release()
+            self.data = None
+        self.map.close()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+# Usage: python sorted_index.py ex7data.json ex7data.idx
+if __name__ == "__main__":
+    count = build_index(sys.argv[1], sys.argv[2])
+    print(f"Wrote {count} values to {sys.argv[2]}")
@@ -0,0 +1,180 @@
+from bisect import bisect_left, bisect_right, insort
+
+from sorting import introsort
+
+# Lookups use bisect rather than ex5's binary_search / insertion code: ex5 runs its
+# benchmarks and plots at import time, so it cannot be imported, and bisect is the same
+# search done in C.
+#
+# A list kept sorted as values stream in. Values live in sorted chunks of at most
+# 2 * CHUNK_SIZE elements; maxes[i] is the largest value in chunk i, and a Fenwick tree
+# over the chunk lengths turns chunk-local positions into global ranks. Insert, delete,
+# bisect and rank all cost O(log n) plus a bounded shift inside a single chunk
+class SortedList:
+    CHUNK_SIZE = 1000
+
+    def __init__(self, iterable=()):
+        values = list(iterable)
+        introsort(values)
+
+        size = self.CHUNK_SIZE
+        self.chunks = [values[i:i + size] for i in range(0, len(values), size)]
+        self.maxes = [chunk[-1] for chunk in self.chunks]
+        self.length = len(values)
+        self.rebuild_tree()
+
+    def __len__(self):
+        return self.length
+
+    def __iter__(self):
+        for chunk in self.chunks:
+            yield from chunk
+
+    def __contains__(self, value):
+        i = bisect_left(self.maxes, value)
+        if i == len(self.maxes):
+            return False
+        chunk = self.chunks[i]
+        return chunk[bisect_left(chunk, value)] == value
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self.length
+        if not 0 <= index < self.length:
+            raise IndexError("SortedList index out of range")
+        i, offset = self.locate(index)
+        return self.chunks[i][offset]
+
+    def __repr__(self):
+        return f"SortedList({list(self)})"
+
+    # Insert value, keeping equal values in insertion order
+    def add(self, value):
+        if not self.chunks:
+            self.chunks.append([value])
+            self.maxes.append(value)
+            self.length = 1
+            self.rebuild_tree()
+            return
+
+        i = bisect_right(self.maxes, value)
+        if i == len(self.maxes):
+            i -= 1
+            self.chunks[i].append(value)
+            self.maxes[i] = value
+        else:
+            insort(self.chunks[i], value)
+
+        self.length += 1
+        if len(self.chunks[i]) > 2 * self.CHUNK_SIZE:
+            self.split(i)
+        else:
+            self.update_tree(i, 1)
+
+    # Remove one occurrence of value; raises ValueError if it is absent
+    def remove(self, value):
+        i = bisect_left(self.maxes, value)
+        if i < len(self.maxes):
+            chunk = self.chunks[i]
+            pos = bisect_left(chunk, value)
+            if chunk[pos] == value:
+                del chunk[pos]
+                self.length -= 1
+                if chunk:
+                    self.maxes[i] = chunk[-1]
+                    self.update_tree(i, -1)
+                else:
+                    del self.chunks[i]
+                    del self.maxes[i]
+                    self.rebuild_tree()
+                return
+        raise ValueError(f"{value!r} not in SortedList")
+
+    def discard(self, value):
+        if value in self:
+            self.remove(value)
+
+    # Number of values < value (the position value would be inserted at on the left)
+    def bisect_left(self, value):
+        i = bisect_left(self.maxes, value)
+        if i == len(self.maxes):
+            return self.length
+        return self.prefix(i) + bisect_left(self.chunks[i], value)
+
+    # Number of values <= value
+    def bisect_right(self, value):
+        i = bisect_right(self.maxes, value)
+        if i == len(self.maxes):
+            return self.length
+        return self.prefix(i) + bisect_right(self.chunks[i], value)
+
+    rank = bisect_left
+
+    # First position of value, or -1 (same contract as the repo's binary_search)
+    def index(self, value):
+        i = bisect_left(self.maxes, value)
+        if i == len(self.maxes):
+            return -1
+        chunk = self.chunks[i]
+        pos = bisect_left(chunk, value)
+        if chunk[pos] != value:
+            return -1
+        return self.prefix(i) + pos
+
+    # Values v with low <= v <= high, in sorted order
+    def irange(self, low, high):
+        i = bisect_left(self.maxes, low)
+        if i == len(self.maxes):
+            return
+        pos = bisect_left(self.chunks[i], low)
+        while i < len(self.chunks):
+            chunk = self.chunks[i]
+            while pos < len(chunk):
+                if high < chunk[pos]:
+                    return
+                yield chunk[pos]
+                pos += 1
+            i += 1
+            pos = 0
+
+    def split(self, i):
+        chunk = self.chunks[i]
+        half = len(chunk) // 2
+        self.chunks[i:i + 1] = [chunk[:half], chunk[half:]]
+        self.maxes[i:i + 1] = [chunk[half - 1], chunk[-1]]
+        self.rebuild_tree()
+
+    # Fenwick tree over chunk lengths: tree[k] covers chunks (k - lowbit(k), k]
+    def rebuild_tree(self):
+        tree = [0] + [len(chunk) for chunk in self.chunks]
+        for k in range(1, len(tree)):
+            parent = k + (k & -k)
+            if parent < len(tree):
+                tree[parent] += tree[k]
+        self.tree = tree
+
+    def update_tree(self, i, delta):
+        k = i + 1
+        while k < len(self.tree):
+            self.tree[k] += delta
+            k += k & -k
+
+    # Total length of chunks[0:i]
+    def prefix(self, i):
+        total = 0
+        while i > 0:
+            total += self.tree[i]
+            i -= i & -i
+        return total
+
+    # (chunk, offset) holding global position index
+    def locate(self, index):
+        k = 0
+        step = 1 << (len(self.tree) - 1).bit_length()
+        while step:
+            nxt = k + step
+            if nxt < len(self.tree) and self.tree[nxt] <= index:
+                k = nxt
+                index -= self.tree[nxt]
+            step >>= 1
+        return k, index
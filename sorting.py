@@ -0,0 +1,309 @@
+import math
+from array import array
+
+from typed_arrays import copy_range, scratch_like
+from vectorized import is_ndarray, np_sort
+
+# Partitions at or below this size are finished with insertion sort
+INSERTION_THRESHOLD = 16
+
+# Partitions above this size use Tukey's ninther instead of median-of-three
+NINTHER_THRESHOLD = 128
+
+# auto_sort leaves inputs of up to this many elements to introsort; below it the O(n)
+# engines' fixed per-pass costs lose (random ints: radix only ties introsort at n=200)
+AUTO_MIN_SIZE = 300
+
+# auto_sort picks counting sort when max - min is at most this many times n. Past about
+# 1-2x, radix sort's fixed byte passes beat walking the count table
+COUNTING_RANGE_FACTOR = 1
+
+# auto_sort picks radix sort for int keys spanning at most this many bits
+RADIX_MAX_BITS = 32
+
+# Insertion sort on arr[low..high] (inclusive)
+def insertion_sort(arr, low, high):
+    for i in range(low + 1, high + 1):
+        key = arr[i]
+        j = i - 1
+        while j >= low and key < arr[j]:
+            arr[j + 1] = arr[j]
+            j -= 1
+        arr[j + 1] = key
+
+# Heapsort on arr[low..high] (inclusive), used when introsort recurses too deep
+def heapsort(arr, low, high):
+    n = high - low + 1
+    for start in range(n // 2 - 1, -1, -1):
+        sift_down(arr, low, start, n)
+    for end in range(n - 1, 0, -1):
+        arr[low], arr[low + end] = arr[low + end], arr[low]
+        sift_down(arr, low, 0, end)
+
+def sift_down(arr, offset, root, size):
+    item = arr[offset + root]
+    child = 2 * root + 1
+    while child < size:
+        # Pick the larger of the two children
+        if child + 1 < size and arr[offset + child] < arr[offset + child + 1]:
+            child += 1
+        if not item < arr[offset + child]:
+            break
+        arr[offset + root] = arr[offset + child]
+        root = child
+        child = 2 * root + 1
+    arr[offset + root] = item
+
+# Return whichever of the indices a, b, c holds the median value
+def median_of_three(arr, a, b, c):
+    if arr[a] < arr[b]:
+        if arr[b] < arr[c]:
+            return b
+        return c if arr[a] < arr[c] else a
+    if arr[a] < arr[c]:
+        return a
+    return c if arr[b] < arr[c] else b
+
+# Median-of-three for mid-sized partitions, ninther (median of three medians) for large ones
+def choose_pivot(arr, low, high):
+    mid = (low + high) // 2
+    if high - low + 1 > NINTHER_THRESHOLD:
+        step = (high - low + 1) // 8
+        a = median_of_three(arr, low, low + step, low + 2 * step)
+        b = median_of_three(arr, mid - step, mid, mid + step)
+        c = median_of_three(arr, high - 2 * step, high - step, high)
+        return median_of_three(arr, a, b, c)
+    return median_of_three(arr, low, mid, high)
+
+# Lomuto partition of arr[low..high] around the chosen pivot, returns the pivot's final index
+def partition(arr, low, high):
+    # Move the chosen pivot to the end so the usual scheme applies
+    p = choose_pivot(arr, low, high)
+    arr[p], arr[high] = arr[high], arr[p]
+    pivot = arr[high]
+
+    i = low - 1
+    for j in range(low, high):
+        if arr[j] <= pivot:
+            i += 1
+            arr[i], arr[j] = arr[j], arr[i]
+
+    arr[i + 1], arr[high] = arr[high], arr[i + 1]
+    return i + 1
+
+# Three-way (Dutch national flag) partition of arr[low..high] around the chosen pivot.
+# Returns (lt, gt) with arr[lt..gt] all equal to the pivot, smaller keys before and
+# larger keys after, so runs of equal keys are never partitioned again
+def partition_three_way(arr, low, high):
+    pivot = arr[choose_pivot(arr, low, high)]
+
+    lt = low
+    i = low
+    gt = high
+    while i <= gt:
+        if arr[i] < pivot:
+            arr[lt], arr[i] = arr[i], arr[lt]
+            lt += 1
+            i += 1
+        elif pivot < arr[i]:
+            arr[i], arr[gt] = arr[gt], arr[i]
+            gt -= 1
+        else:
+            i += 1
+
+    return lt, gt
+
+# Introsort: quicksort with good pivots, falling back to heapsort past 2*log2(n) levels
+# and to insertion sort on small partitions, so it stays O(n log n) on any input.
+# three_way=True partitions into <, == and > the pivot, which makes inputs with only
+# k distinct keys cost O(n log k)
+def introsort(arr, low=0, high=None, three_way=False):
+    if is_ndarray(arr):
+        np_sort(arr[low:high + 1 if high is not None else None])
+        return arr
+
+    if high is None:
+        high = len(arr) - 1
+
+    if low < high:
+        depth_limit = 2 * int(math.log2(high - low + 1))
+        _introsort(arr, low, high, depth_limit, three_way)
+
+    return arr
+
+def _introsort(arr, low, high, depth_limit, three_way=False):
+    while high - low + 1 > INSERTION_THRESHOLD:
+        if depth_limit == 0:
+            heapsort(arr, low, high)
+            return
+        depth_limit -= 1
+
+        if three_way:
+            left_end, right_start = partition_three_way(arr, low, high)
+        else:
+            left_end = right_start = partition(arr, low, high)
+
+        # Recurse into the smaller side and loop on the larger one
+        if left_end - low < high - right_start:
+            _introsort(arr, low, left_end - 1, depth_limit, three_way)
+            low = right_start + 1
+        else:
+            _introsort(arr, right_start + 1, high, depth_limit, three_way)
+            high = left_end - 1
+
+    insertion_sort(arr, low, high)
+
+# Non-recursive quicksort driven by a preallocated array-backed stack. The larger
+# side is pushed and the smaller side handled next, so at most log2(n) ranges are
+# ever pending and no recursion limit is involved at any input size. Like introsort,
+# each range carries its remaining 2*log2(n) depth budget and falls back to heapsort
+# when it runs out, and 3-way partitioning keeps runs of equal keys from degrading it
+def iterative_quicksort(arr, low=0, high=None):
+    if is_ndarray(arr):
+        np_sort(arr[low:high + 1 if high is not None else None])
+        return arr
+
+    if high is None:
+        high = len(arr) - 1
+
+    if low >= high:
+        return arr
+
+    depth_limit = 2 * int(math.log2(high - low + 1))
+    stack_size = int(math.log2(high - low + 1)) + 1
+    stack_low = [0] * stack_size
+    stack_high = [0] * stack_size
+    stack_depth = [0] * stack_size
+    top = 0
+
+    while True:
+        while high - low + 1 > INSERTION_THRESHOLD and depth_limit > 0:
+            depth_limit -= 1
+            left_end, right_start = partition_three_way(arr, low, high)
+
+            if left_end - low < high - right_start:
+                stack_low[top] = right_start + 1
+                stack_high[top] = high
+                high = left_end - 1
+            else:
+                stack_low[top] = low
+                stack_high[top] = left_end - 1
+                low = right_start + 1
+            stack_depth[top] = depth_limit
+            top += 1
+
+        if high - low + 1 > INSERTION_THRESHOLD:
+            heapsort(arr, low, high)
+        else:
+            insertion_sort(arr, low, high)
+
+        if top == 0:
+            return arr
+        top -= 1
+        low = stack_low[top]
+        high = stack_high[top]
+        depth_limit = stack_depth[top]
+
+# Counting sort for int keys in a narrow range: O(n + (max - min)) time and space.
+# smallest/largest are the bounds of arr[low..high] when the caller already has them
+def counting_sort(arr, low=0, high=None, smallest=None, largest=None):
+    if high is None:
+        high = len(arr) - 1
+    if low >= high:
+        return arr
+
+    if smallest is None or largest is None:
+        smallest, largest = key_bounds(arr, low, high)
+
+    counts = [0] * (largest - smallest + 1)
+    for i in range(low, high + 1):
+        counts[arr[i] - smallest] += 1
+
+    index = low
+    for offset, count in enumerate(counts):
+        value = smallest + offset
+        for _ in range(count):
+            arr[index] = value
+            index += 1
+
+    return arr
+
+# LSD radix sort for int keys, one byte per pass. Keys are offset by the minimum so
+# negative values work, and each pass scatters into one scratch buffer of the same
+# representation as arr. O(n * bytes(max - min)) time. numpy arrays go to numpy's sort;
+# smallest/largest are the bounds of arr[low..high] when the caller already has them
+def radix_sort(arr, low=0, high=None, smallest=None, largest=None):
+    if is_ndarray(arr):
+        np_sort(arr[low:high + 1 if high is not None else None])
+        return arr
+
+    if high is None:
+        high = len(arr) - 1
+    if low >= high:
+        return arr
+
+    size = high - low + 1
+    if smallest is None or largest is None:
+        smallest, largest = key_bounds(arr, low, high)
+    key_bits = (largest - smallest).bit_length()
+
+    src = copy_range(arr, low, high + 1)
+    dst = scratch_like(arr, size)
+    for shift in range(0, key_bits, 8):
+        counts = [0] * 256
+        for value in src:
+            counts[((value - smallest) >> shift) & 255] += 1
+
+        # Turn the counts into starting positions
+        total = 0
+        for digit in range(256):
+            counts[digit], total = total, total + counts[digit]
+
+        for value in src:
+            digit = ((value - smallest) >> shift) & 255
+            dst[counts[digit]] = value
+            counts[digit] += 1
+        src, dst = dst, src
+
+    arr[low:high + 1] = src
+    return arr
+
+# Sort with the cheapest engine for the data: numpy arrays go to numpy, and past
+# AUTO_MIN_SIZE elements int keys whose range is within COUNTING_RANGE_FACTOR * n use
+# counting sort, other int keys spanning at most RADIX_MAX_BITS use radix sort, and
+# everything else uses introsort
+def auto_sort(arr, low=0, high=None):
+    if is_ndarray(arr):
+        return introsort(arr, low, high)
+
+    if high is None:
+        high = len(arr) - 1
+    size = high - low + 1
+    if size <= AUTO_MIN_SIZE or not all_ints(arr, low, high):
+        return introsort(arr, low, high)
+
+    smallest, largest = key_bounds(arr, low, high)
+    key_range = largest - smallest
+    if key_range <= COUNTING_RANGE_FACTOR * size:
+        return counting_sort(arr, low, high, smallest, largest)
+    if key_range.bit_length() <= RADIX_MAX_BITS:
+        return radix_sort(arr, low, high, smallest, largest)
+    return introsort(arr, low, high)
+
+# (min, max) of arr[low..high] (non-empty) in one pass; iterating a slice is cheaper
+# than indexing element by element
+def key_bounds(arr, low, high):
+    smallest = largest = arr[low]
+    for value in arr[low + 1:high + 1]:
+        if value < smallest:
+            smallest = value
+        elif value > largest:
+            largest = value
+    return smallest, largest
+
+def all_ints(arr, low, high):
+    if isinstance(arr, array):
+        return arr.typecode in 'bBhHiIlLqQ'
+    if isinstance(arr, memoryview):
+        return arr.format in 'bBhHiIlLqQ'
+    return all(isinstance(arr[i], int) for i in range(low, high + 1))
@@ -0,0 +1,158 @@
+import argparse
+import functools
+import importlib.util
+import json
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import get_context
+
+from benchmark import measure_sort
+from ex1 import merge_sort, natural_merge_sort
+from results_store import ResultStore, load_results
+from sorting import auto_sort, introsort, iterative_quicksort, radix_sort
+from typed_arrays import REPRESENTATIONS, to_representation
+
+# exe2.1.py is not an importable module name, so its bubble sort is loaded by path
+# (once per worker)
+@functools.lru_cache(maxsize=None)
+def load_bubble_sort():
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'exe2.1.py')
+    spec = importlib.util.spec_from_file_location('exe2_1', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.bubble_sort
+
+def bubble_sort(arr):
+    return load_bubble_sort()(arr)
+
+def three_way_quicksort(arr):
+    return introsort(arr, three_way=True)
+
+def bottom_up_merge_sort(arr):
+    return merge_sort(arr, 0, len(arr) - 1)
+
+def timsort_merge_sort(arr):
+    return natural_merge_sort(arr, 0, len(arr) - 1)
+
+# Sorts a sweep can run, by name. Jobs carry only the name, so workers look it up here
+ALGORITHMS = {
+    'bubble': bubble_sort,
+    'quick': introsort,
+    'quick3': three_way_quicksort,
+    'iterative_quick': iterative_quicksort,
+    'merge': bottom_up_merge_sort,
+    'natural_merge': timsort_merge_sort,
+    'radix': radix_sort,
+    'auto': auto_sort,
+}
+
+# Input generators (the exe2.1.py cases), each driven by its own seeded Random
+GENERATORS = {
+    'sorted': lambda size, rng: list(range(size)),
+    'reversed': lambda size, rng: list(range(size, 0, -1)),
+    'random': lambda size, rng: rng.sample(range(size * 10), size),
+    'duplicates': lambda size, rng: [rng.randrange(8) for _ in range(size)],
+}
+
+# Cells are identified by these fields; a results file holds one JSON object per line
+CELL_FIELDS = ('algorithm', 'generator', 'size', 'seed', 'representation')
+
+# Run every (algorithm, generator, size, seed) cell on a process pool with one worker
+# pinned to each available core, appending each result to output_path as it finishes.
+# Cells already in output_path are skipped, so an interrupted sweep resumes where it stopped.
+# Returns the number of cells run
+def run_sweep(algorithms, generators, sizes, seeds, output_path, workers=None, representation='list'):
+    cpus = available_cpus()
+    if workers is None:
+        workers = len(cpus)
+
+    done = completed_cells(output_path)
+    jobs = [(algorithm, generator, size, seed, representation)
+            for algorithm in algorithms for generator in generators
+            for size in sizes for seed in seeds
+            if (algorithm, generator, size, seed, representation) not in done]
+
+    # Largest cells first, so no long job is left running alone at the end
+    jobs.sort(key=lambda job: job[2], reverse=True)
+    print(f"{len(done)} cells already done, {len(jobs)} to run on {workers} workers")
+    if not jobs:
+        return 0
+
+    context = get_context()
+    cpu_queue = context.Queue()
+    for i in range(workers):
+        cpu_queue.put(cpus[i % len(cpus)])
+
+    with open(output_path, 'a', encoding='UTF-8') as output, \
+            ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                                initializer=pin_worker, initargs=(cpu_queue,)) as pool:
+        # A crash can leave a partial last line; start the new records on a fresh one
+        if output.tell() > 0 and not ends_with_newline(output_path):
+            output.write('\n')
+
+        futures = [pool.submit(run_cell, *job) for job in jobs]
+        for count, future in enumerate(as_completed(futures), 1):
+            record = future.result()
+            output.write(json.dumps(record) + '\n')
+            output.flush()
+            print(f"[{count}/{len(jobs)}] {record['algorithm']} {record['generator']} "
+                  f"size {record['size']} seed {record['seed']}: {record['median_ns'] / 1e6:.3f} ms")
+    return len(jobs)
+
+def available_cpus():
+    if hasattr(os, 'sched_getaffinity'):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+# Worker initializer: bind this process to one core so cells do not migrate mid-measurement
+def pin_worker(cpu_queue):
+    cpu = cpu_queue.get()
+    if hasattr(os, 'sched_setaffinity'):
+        os.sched_setaffinity(0, {cpu})
+
+# Worker: build the cell's input from its seed and time the algorithm on it
+def run_cell(algorithm, generator, size, seed, representation):
+    arr = GENERATORS[generator](size, random.Random(seed))
+    arr = to_representation(arr, representation)
+    measurement = measure_sort(ALGORITHMS[algorithm], arr)
+    return {'algorithm': algorithm, 'generator': generator, 'size': size, 'seed': seed,
+            'representation': representation, 'median_ns': measurement.median,
+            'q1_ns': measurement.q1, 'q3_ns': measurement.q3, 'runs': measurement.runs,
+            'outliers': len(measurement.outliers), 'samples_ns': measurement.samples_ns}
+
+# Keys of the cells recorded in a results file
+def completed_cells(path):
+    done = set()
+    for record in load_results(path):
+        done.add(tuple(record[field] for field in CELL_FIELDS))
+    return done
+
+def ends_with_newline(path):
+    with open(path, 'rb') as file:
+        file.seek(-1, os.SEEK_END)
+        return file.read(1) == b'\n'
+
+# Usage: python sweep.py --algorithms bubble quick --sizes 10 100 1000 --seeds 3 --output sweep.jsonl
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time every algorithm x generator x size x seed cell in parallel")
+    parser.add_argument('--algorithms', nargs='+', choices=sorted(ALGORITHMS), default=['bubble', 'quick'])
+    parser.add_argument('--generators', nargs='+', choices=sorted(GENERATORS), default=sorted(GENERATORS))
+    parser.add_argument('--sizes', nargs='+', type=int,
+                        default=[10, 20, 30, 40, 50, 75, 100, 150, 200, 250, 300, 400, 500, 750,
+                                 1000, 1500, 2000, 3000, 5000, 10000])
+    parser.add_argument('--seeds', type=int, default=1, help="inputs generated per cell")
+    parser.add_argument('--workers', type=int, default=None, help="defaults to one per available core")
+    parser.add_argument('--representation', choices=REPRESENTATIONS, default='list')
+    parser.add_argument('--output', default='sweep_results.jsonl')
+    parser.add_argument('--store', default=None, help="SQLite result store to add the finished sweep to")
+    args = parser.parse_args()
+
+    ran = run_sweep(args.algorithms, args.generators, args.sizes, range(args.seeds), args.output,
+                    args.workers, args.representation)
+
+    # Cells the store already holds for this commit are skipped, so resumed sweeps
+    # and repeated runs only add what is new
+    if args.store and ran:
+        with ResultStore(args.store) as store:
+            print(f"Stored {store.import_sweep(args.output)} new results in {args.store}")
@@ -0,0 +1,70 @@
+import sys
+from array import array
+
+from vectorized import is_ndarray, np
+
+# Input representations the benchmarks can run the sorts and searches on
+REPRESENTATIONS = ('list', 'array', 'memoryview', 'numpy')
+
+# Convert a list of ints to the requested representation (packed ones are int64)
+def to_representation(values, representation):
+    if representation == 'list':
+        return list(values)
+    if representation == 'array':
+        return array('q', values)
+    if representation == 'memoryview':
+        return memoryview(array('q', values))
+    if representation == 'numpy':
+        return np.array(values, dtype=np.int64)
+    raise ValueError(f"Unknown representation: {representation}")
+
+# Representation named on a benchmark's command line: --representation NAME, or
+# --vectorized as shorthand for numpy; lists otherwise
+def representation_from_args(argv):
+    if '--representation' in argv:
+        representation = argv[argv.index('--representation') + 1]
+        if representation not in REPRESENTATIONS:
+            raise ValueError(f"Unknown representation: {representation}")
+        return representation
+    if '--vectorized' in argv:
+        return 'numpy'
+    return 'list'
+
+# Independent copy of arr in the same representation (memoryview slices are views,
+# so they need a fresh buffer; everything else has its own copy)
+def copy_array(arr):
+    if isinstance(arr, memoryview):
+        return memoryview(bytearray(arr.tobytes())).cast(arr.format)
+    if isinstance(arr, array):
+        return array(arr.typecode, arr)
+    return arr.copy()
+
+# Copy of arr[low:high] that later writes to arr cannot change. Lists that count their
+# own writes (instrumentation.CountingList) make the copy themselves, so it stays counted
+def copy_range(arr, low, high):
+    if isinstance(arr, memoryview):
+        return copy_array(arr[low:high])
+    if hasattr(arr, 'copy_range'):
+        return arr.copy_range(low, high)
+    return arr[low:high]
+
+# Scratch buffer of size slots that slices of arr can be copied into and back from
+def scratch_like(arr, size):
+    if hasattr(arr, 'scratch_like'):
+        return arr.scratch_like(size)
+    if isinstance(arr, memoryview):
+        return memoryview(bytearray(size * arr.itemsize)).cast(arr.format)
+    if isinstance(arr, array):
+        return array(arr.typecode, bytes(size * arr.itemsize))
+    return [None] * size
+
+# Bytes used by arr including its elements (each boxed int counts for a list)
+def memory_bytes(arr):
+    if isinstance(arr, memoryview):
+        return sys.getsizeof(arr) + arr.nbytes
+    if is_ndarray(arr):
+        # getsizeof already includes the data of an array that owns it
+        return sys.getsizeof(arr) if arr.base is None else sys.getsizeof(arr) + arr.nbytes
+    if isinstance(arr, array):
+        return sys.getsizeof(arr)
+    return sys.getsizeof(arr) + sum(sys.getsizeof(value) for value in arr)
@@ -0,0 +1,36 @@
+try:
+    import numpy as np
+except ImportError:  # numpy is only needed for the vectorized backend
+    np = None
+
+# True when arr should go to the numpy kernels instead of the pure-Python loops
+def is_ndarray(arr):
+    return np is not None and isinstance(arr, np.ndarray)
+
+# In-place numpy sort; kind is 'quicksort' (numpy's introsort) or 'stable' (radix/timsort)
+def np_sort(arr, kind='quicksort'):
+    arr.sort(kind=kind)
+    return arr
+
+# Binary search through np.searchsorted. target may be a single value or a whole
+# batch of targets, in which case an array of positions (-1 if absent) is returned
+def np_binary_search(arr, target):
+    targets = np.asarray(target)
+    if len(arr) == 0:
+        result = np.full(targets.shape, -1, dtype=np.intp)
+    else:
+        positions = np.searchsorted(arr, targets)
+        clipped = np.minimum(positions, len(arr) - 1)
+        found = (positions < len(arr)) & (arr[clipped] == targets)
+        result = np.where(found, positions, -1)
+
+    if result.ndim == 0:
+        return int(result)
+    return result
+
+# Linear search as one vectorized equality scan
+def np_linear_search(arr, target):
+    hits = np.flatnonzero(arr == target)
+    if hits.size:
+        return int(hits[0])
+    return -1